@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "services", "chat"))
+os.environ.setdefault("JWT_PUBLIC_KEY", "")
+
+from sqlalchemy import delete, func, text, update  # noqa: E402
+
+from core.db import Base, SessionLocal, engine  # noqa: E402
+from models.chat import Chat  # noqa: E402
+from services.reaper import reaper  # noqa: E402
+
+SEED = text("""
+    WITH new_chats AS (
+        INSERT INTO chats (id, owner_user_id, title, created_at)
+        SELECT gen_random_uuid(), :owner, 'Bench chat ' || g, now()
+        FROM generate_series(1, :chats) AS g
+        RETURNING id
+    )
+    INSERT INTO messages (id, chat_id, role, content, status, created_at)
+    SELECT gen_random_uuid(), c.id,
+           CASE WHEN g % 2 = 0 THEN 'user' ELSE 'assistant' END,
+           repeat('lorem ipsum ', 20), 'complete', now()
+    FROM new_chats AS c, generate_series(1, :per_chat) AS g
+    """)
+
+
+async def seed(owner: uuid.UUID, chats: int, messages: int) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            SEED, {"owner": owner, "chats": chats, "per_chat": messages // chats}
+        )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare hard and soft deletion of a heavy user's chats."
+    )
+    parser.add_argument("--chats", type=int, default=500)
+    parser.add_argument("--messages", type=int, default=100_000)
+    args = parser.parse_args()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    owner = uuid.uuid4()
+    await seed(owner, args.chats, args.messages)
+    started = time.perf_counter()
+    async with SessionLocal() as db:
+        await db.execute(delete(Chat).where(Chat.owner_user_id == owner))
+        await db.commit()
+    hard = time.perf_counter() - started
+
+    owner = uuid.uuid4()
+    await seed(owner, args.chats, args.messages)
+    started = time.perf_counter()
+    async with SessionLocal() as db:
+        await db.execute(
+            update(Chat)
+            .where(Chat.owner_user_id == owner, Chat.deleted_at.is_(None))
+            .values(deleted_at=func.now())
+        )
+        await db.commit()
+    soft = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await reaper.purge()
+    purge = time.perf_counter() - started
+    stats = reaper.stats()
+
+    print(f"messages:               {args.messages} in {args.chats} chats")
+    print(f"hard DELETE in request: {hard * 1000:.1f} ms")
+    print(f"soft delete in request: {soft * 1000:.1f} ms")
+    print(
+        f"background purge:       {purge * 1000:.1f} ms over {stats['batches']} batches "
+        f"(last {stats['last_batch_seconds'] * 1000:.1f} ms)"
+    )
+    print(
+        f"purged:                 {stats['messages_purged']} messages, "
+        f"{stats['chats_purged']} chats"
+    )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,18 @@
+import httpx
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> None:
+    res = await client.post("/auth/login", json={"email": email, "password": password})
+    if res.status_code == 401:
+        res = await client.post(
+            "/auth/register",
+            json={"full_name": "Bench", "email": email, "password": password},
+        )
+    res.raise_for_status()
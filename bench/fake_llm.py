@@ -0,0 +1,41 @@
+import asyncio
+import hashlib
+import json
+from types import SimpleNamespace
+
+WORDS = (
+    "the quick answer depends on latency throughput buffer window queue index "
+    "query cache replica cursor batch stream token budget context summary "
+    "commit rollback vacuum planner scan join partition shard"
+).split()
+
+
+class FakeChatModel:
+    def __init__(self, tokens: int, delay: float, ttft: float, json_mode: bool = False):
+        self.tokens = tokens
+        self.delay = delay
+        self.ttft = ttft
+        self.json_mode = json_mode
+
+    def _words(self, prompt) -> list[str]:
+        if isinstance(prompt, list):
+            prompt = prompt[-1]
+        seed = hashlib.sha256(str(prompt).encode()).digest()
+        return [WORDS[seed[i % len(seed)] % len(WORDS)] for i in range(self.tokens)]
+
+    async def ainvoke(self, prompt):
+        words = self._words(prompt)
+        await asyncio.sleep(self.ttft)
+        if self.json_mode:
+            return SimpleNamespace(
+                content=json.dumps({"title": " ".join(words[:3]).title()})
+            )
+        return SimpleNamespace(content=" ".join(words))
+
+    async def astream(self, messages):
+        words = self._words(messages)
+        await asyncio.sleep(self.ttft)
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self.delay)
+            yield SimpleNamespace(content=word if i == 0 else f" {word}")
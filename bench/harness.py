@@ -0,0 +1,288 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+import httpx
+
+from common import login, percentile
+
+SERVE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serve.py")
+
+
+@dataclass
+class Phase:
+    name: str
+    service: str
+    latencies: list[float] = field(default_factory=list)
+    ttfts: list[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+    round_trips: float = 0.0
+
+
+@dataclass
+class User:
+    auth: httpx.AsyncClient
+    chat: httpx.AsyncClient | None = None
+    chat_id: str | None = None
+
+
+def ensure_jwt_keys(env: dict[str, str]) -> None:
+    env.setdefault("JWT_ALG", "RS256")
+    if env.get("JWT_PRIVATE_KEY") and env.get("JWT_PUBLIC_KEY"):
+        return
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    env["JWT_PRIVATE_KEY"] = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    env["JWT_PUBLIC_KEY"] = (
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+def start_services(args) -> list[subprocess.Popen]:
+    env = dict(os.environ)
+    if args.database_url:
+        env["DATABASE_URL"] = args.database_url
+    ensure_jwt_keys(env)
+
+    fake = [
+        "--tokens",
+        str(args.tokens),
+        "--token-delay",
+        str(args.token_delay),
+        "--ttft",
+        str(args.ttft),
+    ]
+    return [
+        subprocess.Popen(
+            [sys.executable, SERVE, "auth", "--port", str(args.auth_port)], env=env
+        ),
+        subprocess.Popen(
+            [sys.executable, SERVE, "chat", "--port", str(args.chat_port), *fake],
+            env=env,
+        ),
+    ]
+
+
+async def wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while True:
+            try:
+                if (await client.get(f"{url}/metrics")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not start")
+            await asyncio.sleep(0.2)
+
+
+async def scrape(url: str) -> tuple[float, float]:
+    async with httpx.AsyncClient() as client:
+        text = (await client.get(f"{url}/metrics")).text
+
+    queries = requests = 0.0
+    for line in text.splitlines():
+        if line.startswith("db_query_duration_seconds_count"):
+            queries += float(line.rsplit(" ", 1)[1])
+        elif line.startswith("http_request_duration_seconds_count") and (
+            'route="/metrics"' not in line
+        ):
+            requests += float(line.rsplit(" ", 1)[1])
+    return queries, requests
+
+
+async def run_phase(phase: Phase, url: str, users: list[User], op, settle: float):
+    queries, requests = await scrape(url)
+
+    async def timed(user: User) -> None:
+        started = time.perf_counter()
+        try:
+            ttft = await op(user, started)
+        except httpx.HTTPError:
+            phase.errors += 1
+            return
+        phase.latencies.append(time.perf_counter() - started)
+        if ttft is not None:
+            phase.ttfts.append(ttft)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(user) for user in users))
+    phase.elapsed = time.perf_counter() - started
+
+    await asyncio.sleep(settle)
+    after_queries, after_requests = await scrape(url)
+    if after_requests > requests:
+        phase.round_trips = (after_queries - queries) / (after_requests - requests)
+
+
+async def stream_turn(user: User, query: str, started: float) -> float:
+    body = {"query": query}
+    if user.chat_id:
+        body["chat_id"] = user.chat_id
+
+    ttft = None
+    event = None
+    async with user.chat.stream("POST", "/chats/stream", json=body) as res:
+        res.raise_for_status()
+        async for line in res.aiter_lines():
+            if line.startswith("event: "):
+                event = line[7:]
+            elif line.startswith("data: "):
+                if event == "meta":
+                    user.chat_id = json.loads(line[6:])["chat_id"]
+                elif event == "stream" and ttft is None:
+                    ttft = time.perf_counter() - started
+                elif event == "error":
+                    raise httpx.HTTPError(line[6:])
+    return ttft
+
+
+def report(phases: list[Phase]) -> None:
+    print(
+        f"{'phase':<22}{'ok':>6}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'ttft p50':>10}{'ttft p99':>10}{'db/req':>8}"
+    )
+    for p in phases:
+        ttft = (
+            f"{percentile(p.ttfts, 0.5) * 1000:>10.1f}"
+            f"{percentile(p.ttfts, 0.99) * 1000:>10.1f}"
+            if p.ttfts
+            else f"{'-':>10}{'-':>10}"
+        )
+        rate = len(p.latencies) / p.elapsed if p.elapsed else 0.0
+        print(
+            f"{p.name:<22}{len(p.latencies):>6}{p.errors:>5}{rate:>9.1f}"
+            f"{percentile(p.latencies, 0.5) * 1000:>9.1f}"
+            f"{percentile(p.latencies, 0.99) * 1000:>9.1f}"
+            f"{ttft}{p.round_trips:>8.2f}"
+        )
+
+
+async def bench(args) -> list[Phase]:
+    auth_url = f"http://127.0.0.1:{args.auth_port}"
+    chat_url = f"http://127.0.0.1:{args.chat_port}"
+    await asyncio.gather(wait_ready(auth_url), wait_ready(chat_url))
+
+    users = [
+        User(auth=httpx.AsyncClient(base_url=auth_url, timeout=None))
+        for _ in range(args.users)
+    ]
+    phases: list[Phase] = []
+
+    async def phase(name: str, service: str, op) -> None:
+        p = Phase(name, service)
+        url = auth_url if service == "auth" else chat_url
+        await run_phase(p, url, users, op, args.settle)
+        phases.append(p)
+
+    async def do_login(user: User, started: float) -> None:
+        i = users.index(user)
+        await login(user.auth, f"bench-{i}@example.com", args.password)
+        user.chat = httpx.AsyncClient(
+            base_url=chat_url, cookies=user.auth.cookies, timeout=None
+        )
+
+    async def do_me(user: User, started: float) -> None:
+        (await user.auth.get("/auth/me")).raise_for_status()
+
+    async def do_list(user: User, started: float) -> None:
+        (await user.chat.get("/chats")).raise_for_status()
+
+    async def do_messages(user: User, started: float) -> None:
+        (await user.chat.get(f"/chats/{user.chat_id}/messages")).raise_for_status()
+
+    async def do_title(user: User, started: float) -> None:
+        res = await user.chat.patch(
+            f"/chats/{user.chat_id}", json={"query": args.query}
+        )
+        res.raise_for_status()
+
+    try:
+        await phase("register/login", "auth", do_login)
+        await phase("auth/me", "auth", do_me)
+
+        for turn in range(args.turns):
+            name = "stream (new chat)" if turn == 0 else "stream (follow-up)"
+
+            async def do_stream(user: User, started: float, turn=turn) -> float:
+                return await stream_turn(user, f"{args.query} #{turn}", started)
+
+            await phase(name, "chat", do_stream)
+
+        for _ in range(args.reads):
+            await phase("list chats", "chat", do_list)
+            await phase("load messages", "chat", do_messages)
+
+        await phase("regenerate title", "chat", do_title)
+    finally:
+        for user in users:
+            await user.auth.aclose()
+            if user.chat:
+                await user.chat.aclose()
+
+    return phases
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Start auth and chat against DATABASE_URL with a deterministic fake "
+            "model, drive login, streaming, listing and title flows, and report "
+            "throughput, latency, TTFT and DB round-trips per request."
+        )
+    )
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--auth-port", type=int, default=8101)
+    parser.add_argument("--chat-port", type=int, default=8102)
+    parser.add_argument(
+        "--no-spawn",
+        action="store_true",
+        help="benchmark services already running on the given ports",
+    )
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--reads", type=int, default=3)
+    parser.add_argument("--tokens", type=int, default=64)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--settle", type=float, default=0.2)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--query", default="Explain how TCP slow start works.")
+    args = parser.parse_args()
+
+    if not args.no_spawn and not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    procs = [] if args.no_spawn else start_services(args)
+    try:
+        phases = asyncio.run(bench(args))
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait()
+
+    report(phases)
+
+
+if __name__ == "__main__":
+    main()
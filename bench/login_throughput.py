@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+
+from common import login, percentile
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    email: str,
+    password: str,
+    deadline: float,
+    latencies: list[float],
+    statuses: dict[int, int],
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        res = await client.post(
+            "/auth/login", json={"email": email, "password": password}
+        )
+        latencies.append(time.perf_counter() - started)
+        statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure login throughput against the auth service."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument(
+        "--cores",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="CPU cores available to the auth service",
+    )
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url, timeout=None, limits=limits
+    ) as client:
+        await login(client, args.email, args.password)
+
+        latencies: list[float] = []
+        statuses: dict[int, int] = {}
+        started = time.perf_counter()
+        deadline = started + args.duration
+
+        await asyncio.gather(
+            *(
+                worker(client, args.email, args.password, deadline, latencies, statuses)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    ok = statuses.get(200, 0)
+    print(f"requests:          {len(latencies)} in {elapsed:.2f}s")
+    print(f"statuses:          {dict(sorted(statuses.items()))}")
+    print(f"logins/s:          {ok / elapsed:.1f}")
+    print(f"logins/s/core:     {ok / elapsed / args.cores:.1f}")
+    print(
+        f"latency p50/p99:   {percentile(latencies, 0.5) * 1000:.1f} / {percentile(latencies, 0.99) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+import argparse
+import os
+import sys
+
+import uvicorn
+
+from fake_llm import FakeChatModel
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run one service for benchmarking, with a fake LLM for chat."
+    )
+    parser.add_argument("service", choices=["auth", "chat"])
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--tokens", type=int, default=64)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--ttft", type=float, default=0.05)
+    args = parser.parse_args()
+
+    service_dir = os.path.join(
+        os.path.dirname(__file__), "..", "services", args.service
+    )
+    sys.path.insert(0, os.path.abspath(service_dir))
+
+    from main import app
+
+    if args.service == "chat":
+        from services.backends import pool
+
+        for backend in pool.backends:
+            backend.title_llm = FakeChatModel(
+                8, args.token_delay, args.ttft, json_mode=True
+            )
+            backend.chat_llm = FakeChatModel(args.tokens, args.token_delay, args.ttft)
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import os
+import sys
+import time
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "services", "chat"))
+os.environ.setdefault("JWT_PUBLIC_KEY", "")
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/chatdb")
+
+from core.sse import sse, sse_text  # noqa: E402
+from services.generations import start_generation  # noqa: E402
+
+
+async def run_answer(
+    tokens: int, interval: float, coalesce_ms: int
+) -> tuple[int, int, float]:
+    async def produce(gen) -> None:
+        for i in range(tokens):
+            await asyncio.sleep(interval)
+            gen.publish_text(f" tok{i}")
+        gen.publish("done", {})
+
+    cpu = time.process_time()
+    gen = start_generation(uuid.uuid4(), produce, coalesce_ms)
+
+    frames = 0
+    sent = 0
+    async for frame in gen.subscribe():
+        frames += 1
+        sent += len(frame.encode())
+
+    return frames, sent, time.process_time() - cpu
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare per-token and coalesced SSE framing for one answer."
+    )
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--interval-ms", type=float, default=2.0)
+    parser.add_argument("--windows", default="0,20,30,50")
+    args = parser.parse_args()
+
+    text = " token"
+    n = 200_000
+    generic = timeit.timeit(lambda: sse("stream", {"text": text}, "g:1"), number=n)
+    fast = timeit.timeit(lambda: sse_text(text, "g:1"), number=n)
+    print(f"sse() envelope:      {generic / n * 1e9:.0f} ns/frame")
+    print(f"sse_text() envelope: {fast / n * 1e9:.0f} ns/frame")
+    print()
+
+    for window in (int(w) for w in args.windows.split(",")):
+        started = time.perf_counter()
+        frames, sent, cpu = await run_answer(
+            args.tokens, args.interval_ms / 1000, window
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"window {window:>3} ms: {frames:>5} frames, {frames / elapsed:>7.1f} frames/s, "
+            f"{sent / 1024:>6.1f} KiB, {cpu * 1000:>6.1f} ms CPU per answer"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
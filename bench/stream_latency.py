@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from common import login, percentile
+
+
+async def run_stream(
+    client: httpx.AsyncClient, query: str
+) -> tuple[float, list[float]]:
+    started = time.perf_counter()
+    last = started
+    ttft = 0.0
+    gaps: list[float] = []
+
+    async with client.stream("POST", "/chats/stream", json={"query": query}) as res:
+        res.raise_for_status()
+        async for line in res.aiter_lines():
+            if line != "event: stream":
+                continue
+            now = time.perf_counter()
+            if not ttft:
+                ttft = now - started
+            else:
+                gaps.append(now - last)
+            last = now
+
+    return ttft, gaps
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure token latency across concurrent chat streams."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="bench@example.com")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--query", default="Explain how TCP slow start works.")
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=None) as client:
+        await login(client, args.email, args.password)
+
+        ttfts: list[float] = []
+        gaps: list[float] = []
+        started = time.perf_counter()
+
+        for _ in range(args.rounds):
+            results = await asyncio.gather(
+                *(run_stream(client, args.query) for _ in range(args.concurrency))
+            )
+            for ttft, stream_gaps in results:
+                ttfts.append(ttft)
+                gaps.extend(stream_gaps)
+
+        elapsed = time.perf_counter() - started
+
+    print(f"streams:           {len(ttfts)} in {elapsed:.2f}s")
+    print(
+        f"ttft p50/p99:      {percentile(ttfts, 0.5) * 1000:.1f} / {percentile(ttfts, 0.99) * 1000:.1f} ms"
+    )
+    print(
+        f"token gap p50/p99: {percentile(gaps, 0.5) * 1000:.2f} / {percentile(gaps, 0.99) * 1000:.2f} ms"
+    )
+    print(f"token gap max:     {max(gaps, default=0.0) * 1000:.2f} ms")
+    if gaps:
+        print(f"token gap stdev:   {statistics.pstdev(gaps) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
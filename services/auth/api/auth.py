@@ -1,26 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
 from fastapi import APIRouter, Response, Depends, HTTPException, Cookie
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from jwt import InvalidTokenError, ExpiredSignatureError
 
 from deps.auth import get_current_user
-from core.db import get_db
-from core.password import verify_password, hash_password
+from core.config import REFRESH_REUSE_GRACE
+from core.db import get_db, mark_write
+from core.password import (
+    verify_password,
+    hash_password,
+    needs_rehash,
+    PasswordPoolBusy,
+)
 from core.jwt import create_access_token, create_refresh_token, decode_and_validate
-from core.cookies import set_access_cookies, set_auth_cookies, clear_auth_cookies
+from core.cookies import set_auth_cookies, clear_auth_cookies
+from core.revocation import revocations
 
 from models.user import User
 from schemas.auth import TokenResponse, RegisterRequest, LoginRequest
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+REUSE_GRACE = timedelta(seconds=REFRESH_REUSE_GRACE)
+
+
+def server_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503, detail="Server busy, try again", headers={"Retry-After": "1"}
+    )
+
+
+def reject_reuse(revoked_at: datetime | None) -> None:
+    if revoked_at and datetime.now(timezone.utc) - revoked_at > REUSE_GRACE:
+        raise HTTPException(status_code=401, detail="Refresh token revoked")
+
+
+def find_user(db: Session, email: str) -> User | None:
+    return db.query(User).filter(User.email == email).first()
+
+
+def save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
 
 @router.post("/login", response_model=TokenResponse, status_code=200)
-def login(payload: LoginRequest, response: Response, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
+async def login(
+    payload: LoginRequest, response: Response, db: Session = Depends(get_db)
+):
+    user = await run_in_threadpool(find_user, db, payload.email)
 
-    if not user or not verify_password(payload.password, user.hashed_password):
+    try:
+        valid = user is not None and await verify_password(
+            payload.password, user.hashed_password
+        )
+    except PasswordPoolBusy:
+        raise server_busy()
+
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
+    if needs_rehash(user.hashed_password):
+        try:
+            user.hashed_password = await hash_password(payload.password)
+            await run_in_threadpool(save_user, db, user)
+            mark_write(user.id)
+        except PasswordPoolBusy:
+            pass
+
     access = create_access_token(str(user.id))
     refresh = create_refresh_token(str(user.id))
 
@@ -30,21 +80,25 @@ def login(payload: LoginRequest, response: Response, db: Session = Depends(get_d
 
 
 @router.post("/register", response_model=TokenResponse, status_code=201)
-def register(
+async def register(
     payload: RegisterRequest, response: Response, db: Session = Depends(get_db)
 ):
-    if db.query(User).filter(User.email == payload.email).first():
+    if await run_in_threadpool(find_user, db, payload.email):
         raise HTTPException(status_code=409, detail="Email already exists")
 
+    try:
+        hashed_password = await hash_password(payload.password)
+    except PasswordPoolBusy:
+        raise server_busy()
+
     user = User(
         full_name=payload.full_name,
         email=payload.email,
-        hashed_password=hash_password(payload.password),
+        hashed_password=hashed_password,
     )
 
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await run_in_threadpool(save_user, db, user)
+    mark_write(user.id)
 
     access = create_access_token(str(user.id))
     refresh = create_refresh_token(str(user.id))
@@ -66,7 +120,11 @@ def logout(response: Response):
 
 
 @router.post("/refresh", status_code=200)
-def refresh(response: Response, refresh_token: str | None = Cookie(default=None)):
+def refresh(
+    response: Response,
+    refresh_token: str | None = Cookie(default=None),
+    db: Session = Depends(get_db),
+):
     if not refresh_token:
         raise HTTPException(status_code=401, detail="Missing refresh token")
 
@@ -78,8 +136,23 @@ def refresh(response: Response, refresh_token: str | None = Cookie(default=None)
         raise HTTPException(status_code=401, detail="Invalid refresh token")
 
     user_id = payload["sub"]
+    jti = payload.get("jti")
+    if not jti:
+        raise HTTPException(status_code=401, detail="Invalid refresh token")
+
+    revoked_at = None
+    if revocations.might_be_revoked(jti):
+        revoked_at = revocations.revoked_at(db, jti)
+        reject_reuse(revoked_at)
+
+    expires_at = datetime.fromtimestamp(payload["exp"], timezone.utc)
+    claimed = revocations.revoke(db, jti, user_id, expires_at)
+    if not claimed and revoked_at is None:
+        reject_reuse(revocations.revoked_at(db, jti))
+
     access = create_access_token(user_id)
+    refresh = create_refresh_token(user_id)
 
-    set_access_cookies(response, access_token=access)
+    set_auth_cookies(response, access_token=access, refresh_token=refresh)
 
     return {"ok": True}
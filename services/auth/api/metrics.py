@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from core.jwt import access_token_cache
+from core.user_cache import user_cache
+from core.db import engine, replicas
+from core.revocation import revocations
+
+router = APIRouter(tags=["metrics"])
+
+
+class ServiceCollector:
+    def collect(self):
+        for name, cache in (
+            ("access_token", access_token_cache),
+            ("user", user_cache.local),
+        ):
+            stats = cache.stats()
+            yield CounterMetricFamily(
+                f"{name}_cache_hits", f"{name} cache hits", value=stats["hits"]
+            )
+            yield CounterMetricFamily(
+                f"{name}_cache_misses", f"{name} cache misses", value=stats["misses"]
+            )
+
+        revocation = revocations.stats()
+        yield GaugeMetricFamily(
+            "revocation_filter_inserts",
+            "jti inserts into the revocation Bloom filter",
+            value=revocation["inserts"],
+        )
+        yield CounterMetricFamily(
+            "revocation_filter_positives",
+            "Refresh checks that needed a DB lookup",
+            value=revocation["positives"],
+        )
+
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        for e in (engine, *replicas):
+            checked_out.add_metric([e.pool.role], e.pool.checkedout())
+        yield checked_out
+
+
+REGISTRY.register(ServiceCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
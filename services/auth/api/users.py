@@ -1,16 +1,74 @@
-from typing import List
+import json
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, tuple_
 from sqlalchemy.orm import Session
 
-from core.db import get_db
+from core.db import get_read_db, read_session
+from core.cursor import encode_cursor, decode_cursor
 
 from models.user import User
-from schemas.user import UserRead
+from schemas.user import UsersResponse
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+EXPORT_BATCH_SIZE = 1000
 
-@router.get("", response_model=List[UserRead], status_code=200)
-def read_all_users(db: Session = Depends(get_db)):
-    return db.query(User).all()
+USER_COLUMNS = (
+    User.id,
+    User.full_name,
+    User.email,
+    User.created_at,
+)
+
+
+@router.get("", response_model=UsersResponse, status_code=200)
+def read_all_users(
+    limit: int = Query(100, ge=1, le=1000),
+    after: str | None = None,
+    db: Session = Depends(get_read_db),
+) -> UsersResponse:
+    stmt = select(*USER_COLUMNS)
+    if after is not None:
+        try:
+            cursor = decode_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(User.created_at, User.id) > tuple_(*cursor))
+
+    rows = db.execute(stmt.order_by(User.created_at, User.id).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return UsersResponse(users=[r._asdict() for r in rows], next_cursor=next_cursor)
+
+
+def export_rows():
+    with read_session() as db:
+        result = db.execute(
+            select(*USER_COLUMNS)
+            .order_by(User.created_at, User.id)
+            .execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for rows in result.partitions():
+            yield "".join(
+                json.dumps(
+                    {
+                        "id": str(r.id),
+                        "full_name": r.full_name,
+                        "email": r.email,
+                        "created_at": r.created_at.isoformat(),
+                    }
+                )
+                + "\n"
+                for r in rows
+            )
+
+
+@router.get("/export", status_code=200)
+def export_users() -> StreamingResponse:
+    return StreamingResponse(export_rows(), media_type="application/x-ndjson")
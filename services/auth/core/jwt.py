@@ -3,11 +3,14 @@ import uuid
 
 import jwt
 from jwt import InvalidTokenError
-from .config import JWT_ALG, JWT_PRIVATE_KEY, JWT_PUBLIC_KEY
+from .config import JWT_ALG, JWT_PRIVATE_KEY, JWT_PUBLIC_KEY, TOKEN_CACHE_SIZE
+from .token_cache import TokenCache
 
 ACCESS_TTL = timedelta(minutes=5)
 REFRESH_TTL = timedelta(days=14)
 
+access_token_cache = TokenCache(TOKEN_CACHE_SIZE)
+
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
@@ -42,3 +45,13 @@ def decode_and_validate(token: str, expected_type: str) -> dict:
         raise InvalidTokenError("Wrong token type")
 
     return payload
+
+
+def verify_access_token(token: str) -> dict:
+    cached = access_token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = decode_and_validate(token, expected_type="access")
+    access_token_cache.put(token, payload)
+    return payload
@@ -1,15 +1,52 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+from argon2.exceptions import VerifyMismatchError, InvalidHashError
+
+from .config import (
+    ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST,
+    ARGON2_PARALLELISM,
+    PASSWORD_WORKERS,
+    PASSWORD_QUEUE_SIZE,
+)
+
+ph = PasswordHasher(
+    time_cost=ARGON2_TIME_COST,
+    memory_cost=ARGON2_MEMORY_COST,
+    parallelism=ARGON2_PARALLELISM,
+)
 
-ph = PasswordHasher()
+executor = ThreadPoolExecutor(max_workers=PASSWORD_WORKERS, thread_name_prefix="argon2")
+admission = asyncio.Semaphore(PASSWORD_WORKERS + PASSWORD_QUEUE_SIZE)
 
 
-def hash_password(password: str) -> str:
-    return ph.hash(password)
+class PasswordPoolBusy(Exception):
+    pass
 
 
-def verify_password(password: str, hashed: str) -> bool:
+async def _run(fn, *args):
+    if admission.locked():
+        raise PasswordPoolBusy()
+    async with admission:
+        return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+def _verify(password: str, hashed: str) -> bool:
     try:
         return ph.verify(hashed, password)
-    except VerifyMismatchError:
+    except (VerifyMismatchError, InvalidHashError):
         return False
+
+
+async def hash_password(password: str) -> str:
+    return await _run(ph.hash, password)
+
+
+async def verify_password(password: str, hashed: str) -> bool:
+    return await _run(_verify, password, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    return ph.check_needs_rehash(hashed)
@@ -0,0 +1,137 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from .bloom import BloomFilter
+from .config import (
+    REVOCATION_CAPACITY,
+    REVOCATION_ERROR_RATE,
+    REVOCATION_SYNC_SECONDS,
+    REVOCATION_REBUILD_SECONDS,
+)
+from .db import SessionLocal
+from models.token import RevokedToken
+
+SYNC_OVERLAP = timedelta(seconds=10)
+
+
+class RevocationIndex:
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        rebuild_interval: float,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.watermark: datetime | None = None
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.thread: threading.Thread | None = None
+        self.checks = 0
+        self.positives = 0
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.rebuild()
+            self.stopped.clear()
+            self.thread = threading.Thread(
+                target=self._run, name="revocation-sync", daemon=True
+            )
+            self.thread.start()
+
+    def stop(self) -> None:
+        if self.thread is None:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+
+    def might_be_revoked(self, jti: str) -> bool:
+        self.checks += 1
+        if jti.encode() not in self.filter:
+            return False
+        self.positives += 1
+        return True
+
+    def revoked_at(self, db, jti: str) -> datetime | None:
+        return db.scalar(select(RevokedToken.revoked_at).where(RevokedToken.jti == jti))
+
+    def revoke(self, db, jti: str, user_id: str, expires_at: datetime) -> bool:
+        claimed = db.scalar(
+            insert(RevokedToken)
+            .values(jti=jti, user_id=user_id, expires_at=expires_at)
+            .on_conflict_do_nothing()
+            .returning(RevokedToken.jti)
+        )
+        db.commit()
+        with self.lock:
+            self.filter.add(jti.encode())
+        return claimed is not None
+
+    def _load(self, bloom: BloomFilter, since: datetime | None) -> datetime | None:
+        stmt = select(RevokedToken.jti, RevokedToken.revoked_at)
+        if since is not None:
+            stmt = stmt.where(RevokedToken.revoked_at > since - SYNC_OVERLAP)
+
+        with SessionLocal() as db:
+            rows = db.execute(stmt).all()
+
+        watermark = since
+        with self.lock:
+            for jti, revoked_at in rows:
+                bloom.add(jti.encode())
+                if watermark is None or revoked_at > watermark:
+                    watermark = revoked_at
+        return watermark
+
+    def sync(self) -> None:
+        self.watermark = self._load(self.filter, self.watermark)
+
+    def rebuild(self) -> None:
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+            db.commit()
+            live = db.scalar(select(func.count()).select_from(RevokedToken))
+
+        fresh = BloomFilter(max(self.capacity, live * 2), self.error_rate)
+        watermark = self._load(fresh, None)
+        with self.lock:
+            self.filter = fresh
+            self.watermark = watermark
+
+    def _run(self) -> None:
+        rebuild_at = time.monotonic() + self.rebuild_interval
+        while not self.stopped.wait(self.sync_interval):
+            try:
+                if time.monotonic() >= rebuild_at:
+                    rebuild_at = time.monotonic() + self.rebuild_interval
+                    self.rebuild()
+                else:
+                    self.sync()
+            except Exception:
+                pass
+
+    def stats(self) -> dict:
+        return {
+            "inserts": self.filter.count,
+            "bits": self.filter.size,
+            "checks": self.checks,
+            "positives": self.positives,
+        }
+
+
+revocations = RevocationIndex(
+    REVOCATION_CAPACITY,
+    REVOCATION_ERROR_RATE,
+    REVOCATION_SYNC_SECONDS,
+    REVOCATION_REBUILD_SECONDS,
+)
@@ -0,0 +1,31 @@
+from typing import Any
+
+from .cache import CacheStore, TTLCache
+from .config import USER_CACHE_SIZE, USER_CACHE_TTL
+
+
+class UserCache:
+    def __init__(self, local: TTLCache, shared: CacheStore | None = None):
+        self.local = local
+        self.shared = shared
+
+    def get(self, user_id: str) -> dict[str, Any] | None:
+        row = self.local.get(user_id)
+        if row is None and self.shared is not None:
+            row = self.shared.get(user_id)
+            if row is not None:
+                self.local.set(user_id, row)
+        return row
+
+    def set(self, user_id: str, row: dict[str, Any]) -> None:
+        self.local.set(user_id, row)
+        if self.shared is not None:
+            self.shared.set(user_id, row)
+
+    def invalidate(self, user_id: str) -> None:
+        self.local.delete(user_id)
+        if self.shared is not None:
+            self.shared.delete(user_id)
+
+
+user_cache = UserCache(TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL))
@@ -1,31 +1,35 @@
-from fastapi import Depends, HTTPException, Cookie
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, Cookie
 from jwt import InvalidTokenError, ExpiredSignatureError
 
-from core.db import get_db
-from core.jwt import decode_and_validate
+from core.db import read_session
+from core.jwt import verify_access_token
+from core.user_cache import user_cache
 
-from models.user import User
+from models.user import User, user_row
 
 
-def get_current_user(
-    access_token: str = Cookie(default=None),
-    db: Session = Depends(get_db),
-) -> User:
+def get_current_user(access_token: str = Cookie(default=None)) -> User:
     if not access_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     try:
-        payload = decode_and_validate(access_token, expected_type="access")
+        payload = verify_access_token(access_token)
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Access token expired")
     except InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid access token")
 
     user_id = payload["sub"]
-    user = db.query(User).filter(User.id == user_id).first()
+
+    row = user_cache.get(user_id)
+    if row is not None:
+        return User(**row)
+
+    with read_session(user_id) as db:
+        user = db.query(User).filter(User.id == user_id).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    user_cache.set(user_id, user_row(user))
     return user
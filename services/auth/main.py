@@ -1,13 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.auth import router as auth_router
 from api.users import router as users_router
+from api.metrics import router as metrics_router
 
 from core.db import Base, engine
+from core.metrics import MetricsMiddleware
+from core.revocation import revocations
 from models.user import User
+from models.token import RevokedToken
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    revocations.start()
+    yield
+    revocations.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -19,5 +35,6 @@ app.add_middleware(
 
 app.include_router(auth_router)
 app.include_router(users_router)
+app.include_router(metrics_router)
 
 Base.metadata.create_all(bind=engine)
@@ -1,11 +1,12 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, DateTime, Index, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
 from sqlalchemy.dialects.postgresql import UUID
 
 from core.db import Base
+from core.user_cache import user_cache
 
 
 class User(Base):
@@ -26,3 +27,31 @@ class User(Base):
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+
+    __table_args__ = (Index("ix_users_created_id", "created_at", "id"),)
+
+
+def user_row(user: User) -> dict:
+    return {"id": user.id, "full_name": user.full_name, "email": user.email}
+
+
+@event.listens_for(Session, "after_flush")
+def track_changed_users(session: Session, flush_context) -> None:
+    changed = [
+        str(obj.id)
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User)
+    ]
+    if changed:
+        session.info.setdefault("changed_users", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_changed_users(session: Session) -> None:
+    for user_id in session.info.pop("changed_users", ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_users", None)
@@ -1,3 +1,5 @@
+from typing import List
+
 from pydantic import BaseModel, EmailStr
 from uuid import UUID
 from datetime import datetime
@@ -7,5 +9,9 @@ class UserRead(BaseModel):
     id: UUID
     full_name: str
     email: EmailStr
-    hashed_password: str
     created_at: datetime
+
+
+class UsersResponse(BaseModel):
+    users: List[UserRead]
+    next_cursor: str | None = None
@@ -1,16 +1,43 @@
-from uuid import UUID
-from io import StringIO
-import json
-
-from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta, timezone
+from contextlib import aclosing
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy import delete
-from sqlalchemy.orm import Session
+from sqlalchemy import cast, func, null, select, tuple_, union_all, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from services.llm import create_title, ask
+from services.drafts import DraftWriter
+from services.writer import writer
+from services.scheduler import llm_scheduler, QueueFull
+from services.context import build_history, estimate_tokens
+from services.summary import schedule_summary
+from services.reaper import reaper
+from services.versions import bump_chat, bump_user, bump_versions, user_version
+from services.generations import (
+    Generation,
+    start_generation,
+    get_generation,
+    parse_event_id,
+)
 
-from deps.chat import get_current_user_id
-from core.db import get_db
+from deps.chat import get_current_user_id, get_read_db
+from core.config import STREAM_RESUME_GRACE
+from core.db import SessionLocal, get_db, mark_write
+from core.cursor import encode_cursor, decode_cursor
+from core.etag import make_etag, etag_matches, response_cache
+from core.metrics import (
+    STREAM_TTFT,
+    STREAM_DURATION,
+    STREAM_TOKEN_RATE,
+    STREAM_OUTCOMES,
+    STREAM_DISCONNECTS,
+)
 from models.chat import Chat, Message
 from schemas.chat import (
     ChatsResponse,
@@ -18,78 +45,371 @@ from schemas.chat import (
     MessagesResponse,
     ChatTitleRequest,
     ChatTitleResponse,
+    SearchResponse,
 )
 
 router = APIRouter(prefix="/chats", tags=["chat"])
 
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
 
-@router.get("", response_model=ChatsResponse, status_code=200)
-def load_chats(
-    user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
-) -> ChatsResponse:
-    chats = (
-        db.query(Chat)
-        .filter(Chat.owner_user_id == user_id)
-        .order_by(Chat.created_at.desc())
-        .all()
+CACHE_CONTROL = "private, no-cache"
+
+
+def server_busy() -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail="Too many requests, try again",
+        headers={"Retry-After": "1"},
     )
-    return ChatsResponse(chats=[{"id": c.id, "title": c.title} for c in chats])
 
 
-@router.get("/{chat_id}/messages", response_model=MessagesResponse, status_code=200)
-def load_chat(
-    chat_id: UUID,
-    user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
-) -> MessagesResponse:
-    chat = db.query(Chat).filter(Chat.id == chat_id).first()
-    if not chat:
+async def get_owned_chat(db: AsyncSession, chat_id: UUID, user_id: UUID) -> Chat:
+    chat = await db.get(Chat, chat_id)
+    if not chat or chat.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Chat not found")
     if chat.owner_user_id != user_id:
         raise HTTPException(status_code=403, detail="Forbidden")
+    return chat
+
 
-    messages = (
-        db.query(Message)
-        .filter(Message.chat_id == chat_id)
-        .order_by(Message.created_at.asc())
-        .all()
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
     )
 
-    return MessagesResponse(
-        messages=[{"role": m.role, "content": m.content} for m in messages]
+
+def json_body(body: bytes, etag: str) -> Response:
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL},
     )
 
 
+def parse_cursor(before: str | None):
+    if before is None:
+        return None
+    try:
+        return decode_cursor(before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_after(after: str | None) -> UUID | datetime | None:
+    if after is None:
+        return None
+
+    try:
+        return UUID(after)
+    except ValueError:
+        pass
+    try:
+        since = datetime.fromisoformat(after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid after")
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return since
+
+
+async def newer_than(db: AsyncSession, chat_id: UUID, after: UUID | datetime):
+    if isinstance(after, datetime):
+        return Message.created_at > after
+
+    anchor = (
+        await db.execute(
+            select(Message.created_at, Message.id).where(
+                Message.id == after, Message.chat_id == chat_id
+            )
+        )
+    ).first()
+    if anchor is None:
+        raise HTTPException(status_code=404, detail="Message not found")
+    return tuple_(Message.created_at, Message.id) > tuple_(*anchor)
+
+
+@router.get("", response_model=ChatsResponse, status_code=200)
+async def load_chats(
+    limit: int = Query(50, ge=1, le=200),
+    before: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    cursor = parse_cursor(before)
+
+    version = await user_version(db, user_id)
+    etag = make_etag("chats", user_id, version, limit, before)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    body = response_cache.get(etag)
+    if body is not None:
+        return json_body(body, etag)
+
+    stmt = select(Chat.id, Chat.title, Chat.created_at).where(
+        Chat.owner_user_id == user_id, Chat.deleted_at.is_(None)
+    )
+    if cursor:
+        stmt = stmt.where(tuple_(Chat.created_at, Chat.id) < tuple_(*cursor))
+
+    rows = (
+        await db.execute(
+            stmt.order_by(Chat.created_at.desc(), Chat.id.desc()).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    body = ChatsResponse(
+        chats=[{"id": r.id, "title": r.title} for r in rows],
+        next_cursor=next_cursor,
+    ).model_dump_json()
+    response_cache.set(etag, body)
+    return json_body(body, etag)
+
+
+@router.get("/search", response_model=SearchResponse, status_code=200)
+async def search_chats(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=50),
+    offset: int = Query(0, ge=0, le=1000),
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> SearchResponse:
+    tsquery = func.websearch_to_tsquery("simple", q)
+    owned = (Chat.owner_user_id == user_id, Chat.deleted_at.is_(None))
+
+    title_hits = select(
+        Chat.id.label("chat_id"),
+        Chat.title,
+        cast(null(), PG_UUID(as_uuid=True)).label("message_id"),
+        Chat.title.label("text"),
+        (func.ts_rank(Chat.title_vector, tsquery) * 2).label("rank"),
+        Chat.created_at,
+    ).where(*owned, Chat.title_vector.op("@@")(tsquery))
+
+    message_hits = (
+        select(
+            Message.chat_id,
+            Chat.title,
+            Message.id.label("message_id"),
+            Message.content.label("text"),
+            func.ts_rank(Message.search_vector, tsquery).label("rank"),
+            Message.created_at,
+        )
+        .join(Chat, Chat.id == Message.chat_id)
+        .where(*owned, Message.search_vector.op("@@")(tsquery))
+    )
+
+    hits = union_all(title_hits, message_hits).subquery()
+    page = (
+        select(hits)
+        .order_by(hits.c.rank.desc(), hits.c.created_at.desc())
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+
+    rows = (
+        await db.execute(
+            select(
+                page.c.chat_id,
+                page.c.title,
+                page.c.message_id,
+                page.c.rank,
+                func.ts_headline(
+                    "simple",
+                    page.c.text,
+                    tsquery,
+                    "MaxFragments=2, MaxWords=25, MinWords=8, StartSel=**, StopSel=**",
+                ).label("snippet"),
+            ).order_by(page.c.rank.desc(), page.c.created_at.desc())
+        )
+    ).all()
+
+    next_offset = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_offset = offset + limit
+
+    return SearchResponse(
+        hits=[
+            {
+                "chat_id": r.chat_id,
+                "title": r.title,
+                "message_id": r.message_id,
+                "snippet": r.snippet,
+                "rank": r.rank,
+            }
+            for r in rows
+        ],
+        next_offset=next_offset,
+    )
+
+
+@router.get("/{chat_id}/messages", response_model=MessagesResponse, status_code=200)
+async def load_chat(
+    chat_id: UUID,
+    limit: int = Query(100, ge=1, le=500),
+    before: str | None = None,
+    after: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    user_id: UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_read_db),
+) -> Response:
+    if before is not None and after is not None:
+        raise HTTPException(status_code=400, detail="Use either before or after")
+
+    cursor = parse_cursor(before)
+    since = parse_after(after)
+    chat = await get_owned_chat(db, chat_id, user_id)
+
+    etag = make_etag("messages", chat_id, chat.version, limit, before, after)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    body = response_cache.get(etag)
+    if body is not None:
+        return json_body(body, etag)
+
+    stmt = select(
+        Message.id,
+        Message.role,
+        Message.content,
+        Message.status,
+        Message.created_at,
+        Message.updated_at,
+    ).where(Message.chat_id == chat_id)
+
+    if since is not None:
+        rows = (
+            await db.execute(
+                stmt.where(await newer_than(db, chat_id, since))
+                .order_by(Message.created_at, Message.id)
+                .limit(limit + 1)
+            )
+        ).all()
+
+        # A draft that is still being written is not part of the delta yet;
+        # stop before it so polling with the last returned id picks it up
+        # once it completes. Drafts idle past the resume grace are orphans the
+        # reaper will mark complete, so they are returned as they are.
+        live_since = datetime.now(timezone.utc) - timedelta(seconds=STREAM_RESUME_GRACE)
+        next_cursor = None
+        for i, r in enumerate(rows):
+            if r.status != "complete" and r.updated_at > live_since:
+                rows = rows[:i]
+                break
+        else:
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = str(rows[-1].id)
+    else:
+        if cursor:
+            stmt = stmt.where(tuple_(Message.created_at, Message.id) < tuple_(*cursor))
+
+        rows = (
+            await db.execute(
+                stmt.order_by(Message.created_at.desc(), Message.id.desc()).limit(
+                    limit + 1
+                )
+            )
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        rows.reverse()
+
+    body = MessagesResponse(
+        messages=[{"id": r.id, "role": r.role, "content": r.content} for r in rows],
+        next_cursor=next_cursor,
+    ).model_dump_json()
+    response_cache.set(etag, body)
+    return json_body(body, etag)
+
+
 @router.delete("", status_code=204)
-def delete_chats(
+async def delete_chats(
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> None:
-    db.execute(delete(Chat).where(Chat.owner_user_id == user_id))
-    db.commit()
+    await db.execute(
+        update(Chat)
+        .where(Chat.owner_user_id == user_id, Chat.deleted_at.is_(None))
+        .values(deleted_at=func.now())
+    )
+    await bump_user(db, user_id)
+    await db.commit()
+    mark_write(user_id)
+    reaper.notify()
     return
 
 
 @router.delete("/{chat_id}", status_code=204)
-def delete_chat(
+async def delete_chat(
     chat_id: UUID,
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> None:
-    chat = db.query(Chat).filter(Chat.id == chat_id).first()
-    if not chat:
-        raise HTTPException(status_code=404, detail="Chat not found")
-    if chat.owner_user_id != user_id:
-        raise HTTPException(status_code=403, detail="Forbidden")
+    await get_owned_chat(db, chat_id, user_id)
 
-    db.execute(delete(Chat).where(Chat.id == chat_id))
-    db.commit()
+    await db.execute(
+        update(Chat).where(Chat.id == chat_id).values(deleted_at=func.now())
+    )
+    await bump_chat(db, chat_id)
+    await bump_user(db, user_id)
+    await db.commit()
+    mark_write(user_id)
+    reaper.notify()
     return
 
 
-def sse(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+async def watch_subscription(
+    request: Request, gen: Generation, after: int = 0
+) -> AsyncIterator[str]:
+    disconnected = asyncio.get_running_loop().create_future()
+
+    async def watch() -> None:
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+        if not gen.finished:
+            STREAM_DISCONNECTS.inc()
+        disconnected.set_result(None)
+
+    watcher = asyncio.create_task(watch())
+    try:
+        async for frame in gen.subscribe(after, disconnected):
+            yield frame
+    finally:
+        watcher.cancel()
+
+
+async def generate_title(
+    chat_id: UUID, user_id: UUID, query: str, chat_written: asyncio.Future
+) -> str | None:
+    try:
+        title = await create_title(query, user_id)
+        await chat_written
+
+        async with SessionLocal() as db:
+            await db.execute(update(Chat).where(Chat.id == chat_id).values(title=title))
+            await bump_user(db, user_id)
+            await db.commit()
+        mark_write(user_id)
+    except Exception:
+        return None
+
+    return title
 
 
 @router.post("/stream")
@@ -97,109 +417,204 @@ async def stream_chat_response(
     payload: StreamRequest,
     request: Request,
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
 ):
+    received = time.perf_counter()
     query = payload.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query cannot be blank")
+    if llm_scheduler.is_full():
+        raise server_busy()
 
     chat_id = payload.chat_id
+    title_task = None
+    mark_write(user_id)
 
     if chat_id is not None:
-        chat = db.query(Chat).filter(Chat.id == chat_id).first()
-        if not chat:
-            raise HTTPException(status_code=404, detail="Chat not found")
-        if chat.owner_user_id != user_id:
-            raise HTTPException(status_code=403, detail="Forbidden")
-
-        messages = (
-            db.query(Message)
-            .filter(Message.chat_id == chat_id)
-            .order_by(Message.created_at.desc())
-            .limit(5)
-            .all()
-        )
-        messages.reverse()
-        history = [(m.role, m.content) for m in messages]
+        async with SessionLocal() as db:
+            chat = await get_owned_chat(db, chat_id, user_id)
+            history = await build_history(db, chat, query)
     else:
-        chat = Chat(owner_user_id=user_id, title="New chat")
-        db.add(chat)
-        db.commit()
-        db.refresh(chat)
+        chat_id = uuid4()
+        chat_written = await writer.insert(
+            Chat,
+            {
+                "id": chat_id,
+                "owner_user_id": user_id,
+                "title": "New chat",
+                "created_at": datetime.now(timezone.utc),
+            },
+        )
+        title_task = asyncio.create_task(
+            generate_title(chat_id, user_id, query, chat_written)
+        )
+        history = [("user", query)]
+
+    message_written = await writer.insert(
+        Message,
+        {
+            "id": uuid4(),
+            "chat_id": chat_id,
+            "role": "user",
+            "content": query,
+            "token_count": estimate_tokens(query),
+            "status": "complete",
+            "created_at": datetime.now(timezone.utc),
+        },
+    )
 
-        chat_id = chat.id
-        history = []
+    async def finish(draft: DraftWriter) -> bool:
+        try:
+            await message_written
+        except Exception:
+            saved = False
+        else:
+            saved = True
 
-    history.append(("user", query))
+        try:
+            await draft.finalize()
+        except Exception:
+            saved = False
 
-    user_message = Message(chat_id=chat_id, role="user", content=query)
-    db.add(user_message)
-    db.commit()
-    db.refresh(user_message)
+        if saved:
+            try:
+                await bump_versions(
+                    chat_id, user_id if payload.chat_id is None else None
+                )
+            except Exception:
+                pass
+        return saved
 
-    async def event_stream():
+    async def produce(gen: Generation) -> None:
         if payload.chat_id is None:
-            yield sse("meta", {"chat_id": str(chat_id)})
+            gen.publish("meta", {"chat_id": str(chat_id)})
+
+        draft = DraftWriter(chat_id)
+        pending_title = title_task
+        first_token = None
+        chunks_sent = 0
+        outcome = "cancelled"
 
-        buf = StringIO()
+        if llm_scheduler.must_wait():
+            gen.publish("queued", {"position": llm_scheduler.waiting + 1})
 
         try:
-            async for chunk in ask(history):
-                if await request.is_disconnected():
-                    break
-                if not chunk:
-                    continue
-
-                buf.write(chunk)
-                yield sse("stream", {"text": chunk})
+            async with aclosing(ask(history, user_id)) as chunks:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                        STREAM_TTFT.observe(first_token - received)
+                    chunks_sent += 1
+
+                    draft.append(chunk)
+                    gen.publish_text(chunk)
+
+                    if pending_title and pending_title.done():
+                        title = pending_title.result()
+                        pending_title = None
+                        if title:
+                            gen.publish(
+                                "title", {"chat_id": str(chat_id), "title": title}
+                            )
+            outcome = "done"
+        except QueueFull:
+            outcome = "busy"
+            gen.publish("error", {"message": "Server busy, try again"})
+            return
         except Exception:
-            yield sse("error", {"message": "Generation failed"})
+            outcome = "error"
+            gen.publish("error", {"message": "Generation failed"})
             return
         finally:
-            answer_text = buf.getvalue().strip()
-            if answer_text:
-                assistant_message = Message(
-                    chat_id=chat_id, role="assistant", content=answer_text
-                )
-                db.add(assistant_message)
-                db.commit()
-                db.refresh(assistant_message)
+            finished = time.perf_counter()
+            STREAM_DURATION.observe(finished - received)
+            STREAM_OUTCOMES.labels(outcome).inc()
+            if first_token is not None and finished > first_token:
+                STREAM_TOKEN_RATE.observe(chunks_sent / (finished - first_token))
+
+            saved = await asyncio.shield(finish(draft))
+            mark_write(user_id)
+            schedule_summary(chat_id, user_id)
+
+        if not saved:
+            gen.publish("error", {"message": "Message could not be saved"})
+            return
 
-        yield sse("done", {})
+        if pending_title:
+            title = await pending_title
+            if title:
+                gen.publish("title", {"chat_id": str(chat_id), "title": title})
+
+        gen.publish("done", {})
+
+    gen = start_generation(user_id, produce, payload.coalesce_ms)
 
     return StreamingResponse(
-        event_stream(),
+        watch_subscription(request, gen),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/stream/{generation_id}")
+async def resume_chat_stream(
+    generation_id: str,
+    request: Request,
+    last_event_id: str | None = Header(default=None),
+    user_id: UUID = Depends(get_current_user_id),
+):
+    gen = get_generation(generation_id)
+    if not gen or gen.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Stream not found")
+
+    after = parse_event_id(gen, last_event_id)
+    if not gen.can_resume(after):
+        raise HTTPException(status_code=410, detail="Stream expired")
+
+    return StreamingResponse(
+        watch_subscription(request, gen, after),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
     )
 
 
+@router.delete("/stream/{generation_id}", status_code=204)
+async def cancel_chat_stream(
+    generation_id: str,
+    user_id: UUID = Depends(get_current_user_id),
+) -> None:
+    gen = get_generation(generation_id)
+    if not gen or gen.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Stream not found")
+
+    gen.cancel()
+    return
+
+
 @router.patch("/{chat_id}", response_model=ChatTitleResponse, status_code=200)
 async def regenerate_chat_title(
     chat_id: UUID,
     payload: ChatTitleRequest,
     user_id: UUID = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
 ) -> ChatTitleResponse:
     query = payload.query.strip()
     if not query:
         raise HTTPException(status_code=400, detail="Query cannot be blank")
 
-    chat = db.query(Chat).filter(Chat.id == chat_id).first()
-    if not chat:
-        raise HTTPException(status_code=404, detail="Chat not found")
-    if chat.owner_user_id != user_id:
-        raise HTTPException(status_code=403, detail="Forbidden")
+    async with SessionLocal() as db:
+        await get_owned_chat(db, chat_id, user_id)
 
-    title = await create_title(query)
-    chat.title = title
+    try:
+        title = await create_title(query, user_id)
+    except QueueFull:
+        raise server_busy()
 
-    db.add(chat)
-    db.commit()
-    db.refresh(chat)
+    async with SessionLocal() as db:
+        await db.execute(update(Chat).where(Chat.id == chat_id).values(title=title))
+        await bump_user(db, user_id)
+        await db.commit()
+    mark_write(user_id)
 
-    return ChatTitleResponse(id=chat.id, title=chat.title)
+    return ChatTitleResponse(id=chat_id, title=title)
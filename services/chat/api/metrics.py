@@ -0,0 +1,97 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+from core.db import engine, replicas
+from core.etag import response_cache
+from core.jwt import access_token_cache
+from services.backends import pool
+from services.scheduler import llm_scheduler
+from services.title_cache import title_cache
+from services.writer import writer
+from services.reaper import reaper
+
+router = APIRouter(tags=["metrics"])
+
+
+class ServiceCollector:
+    def collect(self):
+        scheduler = llm_scheduler.stats()
+        yield GaugeMetricFamily(
+            "llm_active", "LLM calls holding a slot", value=scheduler["active"]
+        )
+        yield GaugeMetricFamily(
+            "llm_queue_depth",
+            "LLM calls waiting for a slot",
+            value=scheduler["waiting"],
+        )
+        yield CounterMetricFamily(
+            "llm_rejected",
+            "LLM calls rejected by a full queue",
+            value=scheduler["rejected"],
+        )
+
+        outstanding = GaugeMetricFamily(
+            "llm_backend_outstanding", "In-flight calls per backend", labels=["host"]
+        )
+        healthy = GaugeMetricFamily(
+            "llm_backend_healthy", "1 unless the backend is ejected", labels=["host"]
+        )
+        for backend in pool.stats():
+            outstanding.add_metric([backend["host"]], backend["outstanding"])
+            healthy.add_metric([backend["host"]], int(backend["healthy"]))
+        yield outstanding
+        yield healthy
+
+        checked_out = GaugeMetricFamily(
+            "db_pool_checked_out", "Connections currently checked out", labels=["pool"]
+        )
+        for e in (engine, *replicas):
+            checked_out.add_metric([e.pool.role], e.pool.checkedout())
+        yield checked_out
+
+        yield GaugeMetricFamily(
+            "write_behind_queue_depth",
+            "Rows waiting for the write-behind flush",
+            value=writer.queue.qsize(),
+        )
+
+        for name, cache in (
+            ("access_token", access_token_cache),
+            ("title", title_cache),
+            ("response", response_cache),
+        ):
+            stats = cache.stats()
+            yield CounterMetricFamily(
+                f"{name}_cache_hits", f"{name} cache hits", value=stats["hits"]
+            )
+            yield CounterMetricFamily(
+                f"{name}_cache_misses", f"{name} cache misses", value=stats["misses"]
+            )
+
+        purge = reaper.stats()
+        yield GaugeMetricFamily(
+            "reaper_backlog",
+            "Deleted chats waiting to be purged",
+            value=purge["backlog"],
+        )
+        for name, description in (
+            ("chats_purged", "Deleted chats purged"),
+            ("messages_purged", "Messages purged from deleted chats"),
+            ("batches", "Purge batches committed"),
+            ("drafts_recovered", "Orphaned streaming drafts marked complete"),
+        ):
+            yield CounterMetricFamily(f"reaper_{name}", description, value=purge[name])
+        yield GaugeMetricFamily(
+            "reaper_last_batch_seconds",
+            "Duration of the last purge batch",
+            value=purge["last_batch_seconds"],
+        )
+
+
+REGISTRY.register(ServiceCollector())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
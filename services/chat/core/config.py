@@ -6,3 +6,57 @@ load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL")
 JWT_ALG = os.getenv("JWT_ALG")
 JWT_PUBLIC_KEY = os.environ["JWT_PUBLIC_KEY"].replace("\\n", "\n")
+
+STREAM_FLUSH_INTERVAL = float(os.getenv("STREAM_FLUSH_INTERVAL", "1.0"))
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", "2048"))
+
+WRITER_QUEUE_SIZE = int(os.getenv("WRITER_QUEUE_SIZE", "10000"))
+WRITER_BATCH_SIZE = int(os.getenv("WRITER_BATCH_SIZE", "500"))
+WRITER_MAX_DELAY = float(os.getenv("WRITER_MAX_DELAY", "0.005"))
+
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+
+TITLE_CACHE_SIZE = int(os.getenv("TITLE_CACHE_SIZE", "10000"))
+TITLE_CACHE_TTL = float(os.getenv("TITLE_CACHE_TTL", "86400"))
+TITLE_CACHE_PERSIST = os.getenv("TITLE_CACHE_PERSIST", "false").lower() == "true"
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "100"))
+
+OLLAMA_HOSTS = [
+    h.strip()
+    for h in os.getenv("OLLAMA_HOSTS", "http://localhost:11434").split(",")
+    if h.strip()
+]
+OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
+LLM_EJECT_FAILURES = int(os.getenv("LLM_EJECT_FAILURES", "3"))
+LLM_EJECT_SECONDS = float(os.getenv("LLM_EJECT_SECONDS", "30"))
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3072"))
+CONTEXT_MAX_MESSAGES = int(os.getenv("CONTEXT_MAX_MESSAGES", "50"))
+
+SUMMARY_TRIGGER = int(os.getenv("SUMMARY_TRIGGER", "12"))
+SUMMARY_KEEP_RECENT = int(os.getenv("SUMMARY_KEEP_RECENT", "6"))
+
+STREAM_REPLAY_SIZE = int(os.getenv("STREAM_REPLAY_SIZE", "4096"))
+STREAM_RESUME_GRACE = float(os.getenv("STREAM_RESUME_GRACE", "30"))
+
+STREAM_COALESCE_MS = int(os.getenv("STREAM_COALESCE_MS", "30"))
+STREAM_COALESCE_CHARS = int(os.getenv("STREAM_COALESCE_CHARS", "512"))
+
+REAPER_BATCH_SIZE = int(os.getenv("REAPER_BATCH_SIZE", "5000"))
+REAPER_INTERVAL = float(os.getenv("REAPER_INTERVAL", "30"))
+REAPER_PAUSE = float(os.getenv("REAPER_PAUSE", "0.05"))
+
+DATABASE_REPLICA_URLS = [
+    u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()
+]
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "false").lower() == "true"
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "0"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "300"))
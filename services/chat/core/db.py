@@ -1,18 +1,108 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
-from .config import DATABASE_URL
+import random
+import time
+from typing import Hashable
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+from .cache import TTLCache
+from .config import (
+    DATABASE_URL,
+    DATABASE_REPLICA_URLS,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+    READ_YOUR_WRITES_SECONDS,
+)
+from .metrics import DB_POOL_WAIT, instrument_engine
+
+
+class TimedPool(AsyncAdaptedQueuePool):
+    role = "primary"
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.role = self.role
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.labels(self.role).observe(time.perf_counter() - started)
+
+
+def make_engine(url: str, role: str) -> AsyncEngine:
+    engine = create_async_engine(
+        make_url(url).set(drivername="postgresql+asyncpg"),
+        poolclass=TimedPool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_use_lifo=True,
+    )
+    engine.pool.role = role
+    instrument_engine(engine.sync_engine)
+    return engine
+
+
+engine = make_engine(DATABASE_URL, "primary")
+replicas = [
+    make_engine(url, f"replica-{i}") for i, url in enumerate(DATABASE_REPLICA_URLS)
+]
+recent_writes = TTLCache(100_000, READ_YOUR_WRITES_SECONDS)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is None or self._flushing or isinstance(clause, UpdateBase):
+            return engine.sync_engine
+        return replica
+
+
+SessionLocal = async_sessionmaker(
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+def mark_write(key: Hashable) -> None:
+    if replicas:
+        recent_writes.set(str(key), True)
+
+
+def read_session(key: Hashable) -> AsyncSession:
+    if not replicas or recent_writes.get(str(key)) is not None:
+        return SessionLocal()
+    return SessionLocal(info={"replica": random.choice(replicas).sync_engine})
+
+
+async def dispose_engines() -> None:
+    for e in (engine, *replicas):
+        await e.dispose()
+
+
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
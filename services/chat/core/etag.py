@@ -0,0 +1,21 @@
+import hashlib
+
+from .cache import TTLCache
+from .config import RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL
+
+response_cache = TTLCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+def make_etag(*parts) -> str:
+    raw = "|".join(str(p) for p in parts).encode()
+    return f'"{hashlib.sha256(raw).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
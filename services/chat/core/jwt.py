@@ -1,9 +1,16 @@
 import jwt
 from jwt import InvalidTokenError
-from .config import JWT_ALG, JWT_PUBLIC_KEY
+from .config import JWT_ALG, JWT_PUBLIC_KEY, TOKEN_CACHE_SIZE
+from .token_cache import TokenCache
+
+access_token_cache = TokenCache(TOKEN_CACHE_SIZE)
 
 
 def verify_access_token(access_token: str) -> dict:
+    cached = access_token_cache.get(access_token)
+    if cached is not None:
+        return cached
+
     payload = jwt.decode(
         access_token,
         JWT_PUBLIC_KEY,
@@ -14,4 +21,5 @@ def verify_access_token(access_token: str) -> dict:
     if payload.get("type") != "access":
         raise InvalidTokenError("Wrong token type")
 
+    access_token_cache.put(access_token, payload)
     return payload
@@ -0,0 +1,114 @@
+import time
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "Database statement latency",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool",
+    ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+STREAM_TTFT = Histogram(
+    "chat_stream_ttft_seconds",
+    "Time from request to first streamed token",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+STREAM_DURATION = Histogram(
+    "chat_stream_duration_seconds",
+    "Total generation time",
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
+STREAM_TOKEN_RATE = Histogram(
+    "chat_stream_tokens_per_second",
+    "Streamed chunks per second after the first token",
+    buckets=(1, 5, 10, 20, 40, 80, 160),
+)
+STREAM_OUTCOMES = Counter(
+    "chat_stream_outcomes_total", "Finished generations by outcome", ["outcome"]
+)
+STREAM_DISCONNECTS = Counter(
+    "chat_stream_disconnects_total", "SSE subscribers that went away mid-stream"
+)
+
+LLM_QUEUE_WAIT = Histogram(
+    "llm_queue_wait_seconds",
+    "Time spent waiting for an LLM slot",
+    buckets=(0.0, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM backend call latency",
+    ["host", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+DB_OPERATIONS = {
+    op: DB_QUERY_LATENCY.labels(op)
+    for op in ("select", "insert", "update", "delete", "other")
+}
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                scope["method"], route.path if route else "unmatched", status
+            ).observe(time.perf_counter() - started)
+
+
+def _operation(context) -> str:
+    if context is None:
+        return "other"
+    if context.isinsert:
+        return "insert"
+    if context.isupdate:
+        return "update"
+    if context.isdelete:
+        return "delete"
+    if context.isddl:
+        return "other"
+    return "select"
+
+
+def instrument_engine(engine: Engine) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, params, context, many):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, params, context, many):
+        started = conn.info["query_started"].pop()
+        DB_OPERATIONS[_operation(context)].observe(time.perf_counter() - started)
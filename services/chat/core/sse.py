@@ -0,0 +1,18 @@
+import json
+
+_TEXT_PREFIX = 'event: stream\ndata: {"text": '
+_TEXT_SUFFIX = "}\n\n"
+
+
+def sse(event: str, data: dict, event_id: str | None = None) -> str:
+    frame = f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+    if event_id is not None:
+        return f"id: {event_id}\n{frame}"
+    return frame
+
+
+def sse_text(text: str, event_id: str | None = None) -> str:
+    frame = _TEXT_PREFIX + json.dumps(text, ensure_ascii=False) + _TEXT_SUFFIX
+    if event_id is not None:
+        return f"id: {event_id}\n{frame}"
+    return frame
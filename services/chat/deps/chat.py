@@ -1,7 +1,8 @@
 import uuid
-from fastapi import Cookie, HTTPException
+from fastapi import Cookie, Depends, HTTPException
 from jwt import InvalidTokenError, ExpiredSignatureError
 
+from core.db import read_session
 from core.jwt import verify_access_token
 
 
@@ -22,3 +23,8 @@ def get_current_user_id(
         return uuid.UUID(payload["sub"])
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token subject")
+
+
+async def get_read_db(user_id: uuid.UUID = Depends(get_current_user_id)):
+    async with read_session(user_id) as db:
+        yield db
@@ -1,12 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.chat import router as chat_router
+from api.metrics import router as metrics_router
 
-from core.db import Base, engine
+from core.db import Base, engine, dispose_engines
+from core.metrics import MetricsMiddleware
 from models.chat import Chat, Message
+from services.writer import writer
+from services.reaper import reaper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    writer.start()
+    reaper.start()
+    yield
+    await reaper.stop()
+    await writer.stop()
+    await dispose_engines()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,5 +38,4 @@ app.add_middleware(
 )
 
 app.include_router(chat_router)
-
-Base.metadata.create_all(bind=engine)
+app.include_router(metrics_router)
@@ -1,9 +1,20 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import String, DateTime, ForeignKey, CheckConstraint
+from sqlalchemy import (
+    String,
+    Text,
+    Integer,
+    BigInteger,
+    DateTime,
+    ForeignKey,
+    CheckConstraint,
+    Index,
+    Computed,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 
 from core.db import Base
 
@@ -19,12 +30,42 @@ class Chat(Base):
 
     title: Mapped[str] = mapped_column(String(200), nullable=False)
 
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    summarized_until: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    deleted_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    version: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+    title_vector = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', title)", persisted=True),
+        deferred=True,
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
 
+    __table_args__ = (
+        Index("ix_chats_owner_created", "owner_user_id", "created_at"),
+        Index(
+            "ix_chats_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        Index("ix_chats_title_vector", "title_vector", postgresql_using="gin"),
+    )
+
 
 class Message(Base):
     __tablename__ = "messages"
@@ -37,19 +78,69 @@ class Message(Base):
         UUID(as_uuid=True),
         ForeignKey("chats.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     role: Mapped[str] = mapped_column(String(20), nullable=False)
 
     content: Mapped[str] = mapped_column(String(10_000), nullable=False)
 
+    token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="complete", server_default="complete"
+    )
+
+    search_vector = mapped_column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', content)", persisted=True),
+        deferred=True,
+    )
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
 
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
     __table_args__ = (
         CheckConstraint("role IN ('user', 'assistant')", name="ck_messages_role"),
+        CheckConstraint(
+            "status IN ('streaming', 'complete')", name="ck_messages_status"
+        ),
+        Index("ix_messages_chat_created", "chat_id", "created_at"),
+        Index("ix_messages_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_messages_streaming",
+            "updated_at",
+            postgresql_where=text("status = 'streaming'"),
+        ),
+    )
+
+
+class TitleCacheEntry(Base):
+    __tablename__ = "title_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    title: Mapped[str] = mapped_column(String(200), nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
     )
+
+
+class UserVersion(Base):
+    __tablename__ = "user_versions"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
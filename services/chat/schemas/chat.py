@@ -10,21 +10,38 @@ class ChatItem(BaseModel):
 
 class ChatsResponse(BaseModel):
     chats: List[ChatItem]
+    next_cursor: str | None = None
 
 
 class StreamRequest(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
     chat_id: UUID | None = None
     query: str = Field(..., min_length=1, max_length=4000)
+    coalesce_ms: int | None = Field(default=None, ge=0, le=250)
 
 
 class Message(BaseModel):
+    id: UUID
     role: Literal["user", "assistant"]
     content: str
 
 
 class MessagesResponse(BaseModel):
     messages: List[Message]
+    next_cursor: str | None = None
+
+
+class SearchHit(BaseModel):
+    chat_id: UUID
+    title: str
+    message_id: UUID | None = None
+    snippet: str
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    hits: List[SearchHit]
+    next_offset: int | None = None
 
 
 class ChatTitleRequest(BaseModel):
@@ -0,0 +1,97 @@
+import time
+from contextlib import asynccontextmanager
+
+from langchain_ollama import ChatOllama
+
+from core.config import (
+    OLLAMA_HOSTS,
+    OLLAMA_MODEL,
+    LLM_EJECT_FAILURES,
+    LLM_EJECT_SECONDS,
+)
+from core.metrics import LLM_LATENCY
+
+
+class Backend:
+    def __init__(self, host: str, model: str):
+        self.host = host
+        self.title_llm = ChatOllama(
+            base_url=host, model=model, temperature=0.3, format="json"
+        )
+        self.chat_llm = ChatOllama(base_url=host, model=model, temperature=0.2)
+        self.outstanding = 0
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_ewma = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def record(self, latency: float, ok: bool) -> None:
+        LLM_LATENCY.labels(self.host, "ok" if ok else "error").observe(latency)
+        self.requests += 1
+        self.latency_total += latency
+        self.latency_ewma = (
+            latency if self.requests == 1 else 0.8 * self.latency_ewma + 0.2 * latency
+        )
+
+        if ok:
+            self.failures = 0
+            return
+
+        self.errors += 1
+        self.failures += 1
+        if self.failures >= LLM_EJECT_FAILURES:
+            self.ejected_until = time.monotonic() + LLM_EJECT_SECONDS
+            self.failures = 0
+
+    def stats(self) -> dict:
+        return {
+            "host": self.host,
+            "healthy": self.healthy(time.monotonic()),
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_avg": self.latency_total / self.requests if self.requests else 0.0,
+            "latency_ewma": self.latency_ewma,
+        }
+
+
+class BackendPool:
+    def __init__(self, backends: list[Backend]):
+        self.backends = backends
+
+    def __len__(self) -> int:
+        return len(self.backends)
+
+    def pick(self, exclude: set[Backend] = frozenset()) -> Backend:
+        now = time.monotonic()
+        candidates = [b for b in self.backends if b not in exclude] or self.backends
+        healthy = [b for b in candidates if b.healthy(now)]
+        if not healthy:
+            return min(candidates, key=lambda b: b.ejected_until)
+        return min(healthy, key=lambda b: b.outstanding)
+
+    @asynccontextmanager
+    async def lease(self, exclude: set[Backend] = frozenset()):
+        backend = self.pick(exclude)
+        backend.outstanding += 1
+        started = time.monotonic()
+        try:
+            yield backend
+        except Exception:
+            backend.record(time.monotonic() - started, ok=False)
+            raise
+        else:
+            backend.record(time.monotonic() - started, ok=True)
+        finally:
+            backend.outstanding -= 1
+
+    def stats(self) -> list[dict]:
+        return [b.stats() for b in self.backends]
+
+
+pool = BackendPool([Backend(host, OLLAMA_MODEL) for host in OLLAMA_HOSTS])
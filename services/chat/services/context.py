@@ -0,0 +1,54 @@
+import re
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import CONTEXT_TOKEN_BUDGET, CONTEXT_MAX_MESSAGES
+from models.chat import Chat, Message
+
+_token_re = re.compile(r"\w{1,4}|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    return len(_token_re.findall(text))
+
+
+async def build_history(
+    db: AsyncSession, chat: Chat, query: str
+) -> list[tuple[str, str]]:
+    budget = CONTEXT_TOKEN_BUDGET - estimate_tokens(query)
+    if chat.summary:
+        budget -= estimate_tokens(chat.summary)
+
+    stmt = select(Message.id, Message.role, Message.content, Message.token_count).where(
+        Message.chat_id == chat.id, Message.status == "complete"
+    )
+    if chat.summarized_until is not None:
+        stmt = stmt.where(Message.created_at > chat.summarized_until)
+
+    rows = await db.execute(
+        stmt.order_by(Message.created_at.desc()).limit(CONTEXT_MAX_MESSAGES)
+    )
+
+    history = []
+    backfill = []
+    for row in rows:
+        tokens = row.token_count
+        if tokens is None:
+            tokens = estimate_tokens(row.content)
+            backfill.append({"id": row.id, "token_count": tokens})
+        if tokens > budget:
+            break
+        budget -= tokens
+        history.append((row.role, row.content))
+
+    if backfill:
+        await db.execute(update(Message), backfill)
+        await db.commit()
+
+    if chat.summary:
+        history.append(
+            ("system", f"Summary of the earlier conversation:\n{chat.summary}")
+        )
+    history.reverse()
+    history.append(("user", query))
+    return history
@@ -0,0 +1,90 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+from io import StringIO
+
+from sqlalchemy import update
+
+from core.config import STREAM_FLUSH_INTERVAL, STREAM_FLUSH_CHARS
+from core.db import SessionLocal
+from models.chat import Message
+from services.context import estimate_tokens
+from services.writer import writer
+
+
+class DraftWriter:
+    def __init__(self, chat_id: uuid.UUID):
+        self.chat_id = chat_id
+        self.message_id = uuid.uuid4()
+        self.created_at = datetime.now(timezone.utc)
+        self.inserted = False
+        self.buf = StringIO()
+        self.pending = 0
+        self.flushed_at = time.monotonic()
+        self.task: asyncio.Task | None = None
+
+    def text(self) -> str:
+        return self.buf.getvalue().strip()
+
+    def append(self, chunk: str) -> None:
+        self.buf.write(chunk)
+        self.pending += len(chunk)
+
+        if self.task and not self.task.done():
+            return
+
+        now = time.monotonic()
+        if (
+            self.pending < STREAM_FLUSH_CHARS
+            and now - self.flushed_at < STREAM_FLUSH_INTERVAL
+        ):
+            return
+
+        self.pending = 0
+        self.flushed_at = now
+        self.task = asyncio.create_task(self._flush(self.text()))
+
+    async def _flush(self, content: str) -> None:
+        try:
+            await self._write(content, "streaming")
+        except Exception:
+            pass
+
+    async def _write(self, content: str, status: str) -> None:
+        if not content:
+            return
+
+        if not self.inserted:
+            written = await writer.insert(
+                Message,
+                {
+                    "id": self.message_id,
+                    "chat_id": self.chat_id,
+                    "role": "assistant",
+                    "content": content,
+                    "token_count": estimate_tokens(content),
+                    "status": status,
+                    "created_at": self.created_at,
+                },
+            )
+            await written
+            self.inserted = True
+            return
+
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Message)
+                .where(Message.id == self.message_id)
+                .values(
+                    content=content,
+                    token_count=estimate_tokens(content),
+                    status=status,
+                )
+            )
+            await db.commit()
+
+    async def finalize(self) -> None:
+        if self.task:
+            await self.task
+        await self._write(self.text(), "complete")
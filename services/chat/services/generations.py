@@ -0,0 +1,179 @@
+import asyncio
+import time
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import UUID, uuid4
+
+from core.config import (
+    STREAM_REPLAY_SIZE,
+    STREAM_RESUME_GRACE,
+    STREAM_COALESCE_MS,
+    STREAM_COALESCE_CHARS,
+)
+from core.sse import sse, sse_text
+
+
+class Generation:
+    def __init__(self, user_id: UUID, coalesce_ms: int, coalesce_chars: int):
+        self.id = uuid4().hex
+        self.user_id = user_id
+        self.seq = 0
+        self.buffer: deque[tuple[int, str]] = deque(maxlen=STREAM_REPLAY_SIZE)
+        self.waiter = asyncio.get_running_loop().create_future()
+        self.finished = False
+        self.subscribers = 0
+        self.task: asyncio.Task | None = None
+        self.expiry: asyncio.TimerHandle | None = None
+        self.coalesce_window = coalesce_ms / 1000
+        self.coalesce_chars = coalesce_chars
+        self.pending: list[str] = []
+        self.pending_chars = 0
+        self.flushed_at = 0.0
+        self.flush_timer: asyncio.TimerHandle | None = None
+
+    def _append(self, frame: str) -> None:
+        self.buffer.append((self.seq, frame))
+        self._wake()
+
+    def publish(self, event: str, data: dict) -> None:
+        self.flush_text()
+        self.seq += 1
+        self._append(sse(event, data, f"{self.id}:{self.seq}"))
+
+    def publish_text(self, text: str) -> None:
+        self.pending.append(text)
+        self.pending_chars += len(text)
+
+        if (
+            self.pending_chars >= self.coalesce_chars
+            or time.monotonic() - self.flushed_at >= self.coalesce_window
+        ):
+            self.flush_text()
+        elif self.flush_timer is None:
+            self.flush_timer = asyncio.get_running_loop().call_later(
+                self.coalesce_window, self.flush_text
+            )
+
+    def flush_text(self) -> None:
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        if not self.pending:
+            return
+
+        text = self.pending[0] if len(self.pending) == 1 else "".join(self.pending)
+        self.pending.clear()
+        self.pending_chars = 0
+        self.flushed_at = time.monotonic()
+
+        self.seq += 1
+        self._append(sse_text(text, f"{self.id}:{self.seq}"))
+
+    def close(self) -> None:
+        self.flush_text()
+        self.finished = True
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self.waiter
+        self.waiter = asyncio.get_running_loop().create_future()
+        waiter.set_result(None)
+
+    def can_resume(self, after: int) -> bool:
+        return not self.buffer or self.buffer[0][0] <= after + 1
+
+    async def subscribe(
+        self, after: int = 0, disconnected: asyncio.Future | None = None
+    ) -> AsyncIterator[str]:
+        self.subscribers += 1
+        if self.expiry is not None:
+            self.expiry.cancel()
+            self.expiry = None
+
+        try:
+            while True:
+                waiter = self.waiter
+
+                if not self.can_resume(after):
+                    yield sse("error", {"message": "Stream expired"})
+                    return
+
+                if self.buffer and after < self.seq:
+                    start = after - self.buffer[0][0] + 1
+                    for seq, frame in list(islice(self.buffer, start, None)):
+                        after = seq
+                        yield frame
+                    continue
+
+                if self.finished:
+                    return
+
+                if disconnected is None:
+                    await waiter
+                    continue
+
+                await asyncio.wait(
+                    (waiter, disconnected), return_when=asyncio.FIRST_COMPLETED
+                )
+                if disconnected.done():
+                    return
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.finished:
+                self.expiry = asyncio.get_running_loop().call_later(
+                    STREAM_RESUME_GRACE, self._expire
+                )
+
+    def _expire(self) -> None:
+        self.expiry = None
+        if self.subscribers == 0:
+            self.cancel()
+
+    def cancel(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
+_generations: dict[str, Generation] = {}
+
+
+def start_generation(
+    user_id: UUID,
+    produce: Callable[[Generation], Awaitable[None]],
+    coalesce_ms: int | None = None,
+) -> Generation:
+    gen = Generation(
+        user_id,
+        STREAM_COALESCE_MS if coalesce_ms is None else coalesce_ms,
+        STREAM_COALESCE_CHARS,
+    )
+    _generations[gen.id] = gen
+
+    async def run() -> None:
+        try:
+            await produce(gen)
+        except asyncio.CancelledError:
+            gen.publish("cancelled", {})
+            raise
+        finally:
+            gen.close()
+            asyncio.get_running_loop().call_later(
+                STREAM_RESUME_GRACE, _generations.pop, gen.id, None
+            )
+
+    gen.task = asyncio.create_task(run())
+    return gen
+
+
+def get_generation(generation_id: str) -> Generation | None:
+    return _generations.get(generation_id)
+
+
+def parse_event_id(generation: Generation, event_id: str | None) -> int:
+    if not event_id:
+        return 0
+    gen_id, _, seq = event_id.partition(":")
+    if gen_id != generation.id or not seq.isdigit():
+        return 0
+    return int(seq)
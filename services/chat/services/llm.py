@@ -1,29 +1,85 @@
-from typing import AsyncIterator
+from typing import AsyncIterator, Hashable
 import json
-from langchain_ollama import ChatOllama
 
-title_llm = ChatOllama(model="llama3", temperature=0.3, format="json")
-chat_llm = ChatOllama(model="llama3", temperature=0.2)
+from services.backends import pool
+from services.title_cache import title_cache
+from services.scheduler import (
+    llm_scheduler,
+    PRIORITY_TITLE,
+    PRIORITY_ANSWER,
+    PRIORITY_BACKGROUND,
+)
 
 
-async def create_title(query: str) -> str:
+async def invoke(kind: str, prompt: str, user_id: Hashable, priority: int):
+    async with llm_scheduler.slot(user_id, priority):
+        tried = set()
+        while True:
+            try:
+                async with pool.lease(tried) as backend:
+                    tried.add(backend)
+                    return await getattr(backend, kind).ainvoke(prompt)
+            except Exception:
+                if len(tried) >= len(pool):
+                    raise
+
+
+async def create_title(query: str, user_id: Hashable) -> str:
+    cached = await title_cache.get(query)
+    if cached is not None:
+        return cached
+
     prompt = (
         'Return ONLY valid JSON: {"title":"..."}.\n'
         "Make a short topic title (1-3 words) based on the user query below:\n"
         f"{query}\n"
     )
 
-    result = await title_llm.ainvoke(prompt)
+    result = await invoke("title_llm", prompt, user_id, PRIORITY_TITLE)
 
     try:
         data = json.loads(result.content)
         title = str(data.get("title", "")).strip()
-        return title or "New chat"
     except Exception:
         return "New chat"
 
+    if not title:
+        return "New chat"
+
+    title = title[:200]
+    await title_cache.set(query, title)
+    return title
+
+
+async def ask(history: list, user_id: Hashable) -> AsyncIterator[str]:
+    async with llm_scheduler.slot(user_id, PRIORITY_ANSWER):
+        tried = set()
+        while True:
+            started = False
+            try:
+                async with pool.lease(tried) as backend:
+                    tried.add(backend)
+                    async for chunk in backend.chat_llm.astream(history):
+                        if chunk.content:
+                            started = True
+                            yield chunk.content
+                return
+            except Exception:
+                if started or len(tried) >= len(pool):
+                    raise
+
+
+async def summarize(
+    summary: str | None, messages: list[tuple[str, str]], user_id: Hashable
+) -> str:
+    transcript = "\n".join(f"{role}: {content}" for role, content in messages)
+    prompt = (
+        "Update the running summary of a conversation between a user and an "
+        "assistant. Keep facts, decisions and open questions; drop small talk. "
+        "Answer with the updated summary only, at most 200 words.\n\n"
+        f"Current summary:\n{summary or '(none)'}\n\n"
+        f"New messages:\n{transcript}\n"
+    )
 
-async def ask(history: list) -> AsyncIterator[str]:
-    async for chunk in chat_llm.astream(history):
-        if chunk.content:
-            yield chunk.content
+    result = await invoke("chat_llm", prompt, user_id, PRIORITY_BACKGROUND)
+    return result.content.strip()
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, select, update
+
+from core.config import (
+    REAPER_BATCH_SIZE,
+    REAPER_INTERVAL,
+    REAPER_PAUSE,
+    STREAM_RESUME_GRACE,
+)
+from core.db import SessionLocal
+from models.chat import Chat, Message
+from services.versions import bump_chat
+
+
+class Reaper:
+    def __init__(
+        self, batch_size: int, interval: float, pause: float, draft_grace: float
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.pause = pause
+        self.draft_grace = draft_grace
+        self.wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+        self.chats_purged = 0
+        self.messages_purged = 0
+        self.batches = 0
+        self.last_batch_seconds = 0.0
+        self.drafts_recovered = 0
+        self.backlog = 0
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+
+    def notify(self) -> None:
+        self.wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.recover_drafts()
+            except Exception:
+                pass
+
+            try:
+                await self.purge()
+            except Exception:
+                pass
+
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+
+    async def recover_drafts(self) -> None:
+        # A draft nobody has written to within the resume grace belongs to a
+        # generation that died (crash, restart, failed finalize). Keep the
+        # partial text and mark it complete so history and deltas move on.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.draft_grace)
+        async with SessionLocal() as db:
+            chat_ids = (
+                await db.scalars(
+                    update(Message)
+                    .where(Message.status == "streaming", Message.updated_at < cutoff)
+                    .values(status="complete")
+                    .returning(Message.chat_id)
+                )
+            ).all()
+            for chat_id in set(chat_ids):
+                await bump_chat(db, chat_id)
+            await db.commit()
+
+        self.drafts_recovered += len(chat_ids)
+
+    async def purge(self) -> None:
+        self.backlog = await self.pending()
+        while True:
+            async with SessionLocal() as db:
+                chat_ids = list(
+                    await db.scalars(
+                        select(Chat.id)
+                        .where(Chat.deleted_at.is_not(None))
+                        .limit(100)
+                        .with_for_update(skip_locked=True, key_share=True)
+                    )
+                )
+                if not chat_ids:
+                    return
+
+                started = time.monotonic()
+                batch = (
+                    select(Message.id)
+                    .where(Message.chat_id.in_(chat_ids))
+                    .limit(self.batch_size)
+                    .with_for_update(skip_locked=True)
+                    .scalar_subquery()
+                )
+                result = await db.execute(delete(Message).where(Message.id.in_(batch)))
+                purged = result.rowcount
+
+                if purged == 0:
+                    result = await db.execute(delete(Chat).where(Chat.id.in_(chat_ids)))
+                    self.chats_purged += result.rowcount
+                    self.backlog = max(0, self.backlog - result.rowcount)
+
+                await db.commit()
+
+            self.messages_purged += purged
+            self.batches += 1
+            self.last_batch_seconds = time.monotonic() - started
+            await asyncio.sleep(self.pause)
+
+    async def pending(self) -> int:
+        async with SessionLocal() as db:
+            return await db.scalar(
+                select(func.count())
+                .select_from(Chat)
+                .where(Chat.deleted_at.is_not(None))
+            )
+
+    def stats(self) -> dict:
+        return {
+            "chats_purged": self.chats_purged,
+            "messages_purged": self.messages_purged,
+            "batches": self.batches,
+            "last_batch_seconds": self.last_batch_seconds,
+            "drafts_recovered": self.drafts_recovered,
+            "backlog": self.backlog,
+        }
+
+
+reaper = Reaper(REAPER_BATCH_SIZE, REAPER_INTERVAL, REAPER_PAUSE, STREAM_RESUME_GRACE)
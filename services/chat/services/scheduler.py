@@ -0,0 +1,124 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Hashable
+
+from core.config import LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE
+from core.metrics import LLM_QUEUE_WAIT
+
+PRIORITY_TITLE = 0
+PRIORITY_ANSWER = 1
+PRIORITY_BACKGROUND = 2
+PRIORITIES = (PRIORITY_TITLE, PRIORITY_ANSWER, PRIORITY_BACKGROUND)
+
+
+class QueueFull(Exception):
+    pass
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self.queues: dict[int, OrderedDict[Hashable, deque[asyncio.Future]]] = {
+            p: OrderedDict() for p in PRIORITIES
+        }
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def must_wait(self) -> bool:
+        return self.active >= self.max_concurrency or self.waiting > 0
+
+    def is_full(self) -> bool:
+        return self.must_wait() and self.waiting >= self.max_queue
+
+    @asynccontextmanager
+    async def slot(self, user_id: Hashable, priority: int):
+        await self.acquire(user_id, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, user_id: Hashable, priority: int) -> None:
+        if not self.must_wait():
+            self.active += 1
+            self._record(0.0)
+            return
+
+        if self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise QueueFull()
+
+        started = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        self.queues[priority].setdefault(user_id, deque()).append(future)
+        self.waiting += 1
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._discard(priority, user_id, future)
+            raise
+
+        self._record(time.monotonic() - started)
+
+    def release(self) -> None:
+        self.active -= 1
+        while self.active < self.max_concurrency:
+            future = self._next()
+            if future is None:
+                return
+            self.active += 1
+            future.set_result(None)
+
+    def _next(self) -> asyncio.Future | None:
+        for priority in PRIORITIES:
+            users = self.queues[priority]
+            while users:
+                user_id, waiters = users.popitem(last=False)
+                future = waiters.popleft()
+                if waiters:
+                    users[user_id] = waiters
+                self.waiting -= 1
+                if not future.cancelled():
+                    return future
+        return None
+
+    def _discard(
+        self, priority: int, user_id: Hashable, future: asyncio.Future
+    ) -> None:
+        waiters = self.queues[priority].get(user_id)
+        if waiters is None or future not in waiters:
+            return
+        waiters.remove(future)
+        if not waiters:
+            del self.queues[priority][user_id]
+        self.waiting -= 1
+
+    def _record(self, waited: float) -> None:
+        self.admitted += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        LLM_QUEUE_WAIT.observe(waited)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_avg": self.wait_total / self.admitted if self.admitted else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+llm_scheduler = LLMScheduler(LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE)
@@ -0,0 +1,67 @@
+import asyncio
+from uuid import UUID
+
+from sqlalchemy import select, update
+
+from core.config import SUMMARY_TRIGGER, SUMMARY_KEEP_RECENT
+from core.db import SessionLocal
+from models.chat import Chat, Message
+from services.llm import summarize
+
+_running: set[UUID] = set()
+_tasks: set[asyncio.Task] = set()
+
+
+def schedule_summary(chat_id: UUID, user_id: UUID) -> None:
+    if chat_id in _running:
+        return
+
+    _running.add(chat_id)
+    task = asyncio.create_task(update_summary(chat_id, user_id))
+    _tasks.add(task)
+
+    def done(t: asyncio.Task) -> None:
+        _tasks.discard(t)
+        _running.discard(chat_id)
+
+    task.add_done_callback(done)
+
+
+async def update_summary(chat_id: UUID, user_id: UUID) -> None:
+    try:
+        async with SessionLocal() as db:
+            chat = await db.get(Chat, chat_id)
+            if chat is None:
+                return
+            previous, summarized_until = chat.summary, chat.summarized_until
+
+            stmt = select(Message.role, Message.content, Message.created_at).where(
+                Message.chat_id == chat_id, Message.status == "complete"
+            )
+            if summarized_until is not None:
+                stmt = stmt.where(Message.created_at > summarized_until)
+
+            rows = (await db.execute(stmt.order_by(Message.created_at.asc()))).all()
+
+        if len(rows) < SUMMARY_TRIGGER:
+            return
+
+        fold = rows[: len(rows) - SUMMARY_KEEP_RECENT]
+        summary = await summarize(
+            previous, [(r.role, r.content) for r in fold], user_id
+        )
+        if not summary:
+            return
+
+        async with SessionLocal() as db:
+            await db.execute(
+                update(Chat)
+                .where(
+                    Chat.id == chat_id,
+                    Chat.summarized_until.is_not_distinct_from(summarized_until),
+                )
+                .values(summary=summary, summarized_until=fold[-1].created_at)
+            )
+            await db.commit()
+    except Exception:
+        pass
@@ -0,0 +1,63 @@
+import hashlib
+import re
+
+from sqlalchemy.dialects.postgresql import insert
+
+from core.cache import TTLCache
+from core.config import TITLE_CACHE_SIZE, TITLE_CACHE_TTL, TITLE_CACHE_PERSIST
+from core.db import SessionLocal
+from models.chat import TitleCacheEntry
+
+_non_word = re.compile(r"[^\w]+")
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(_non_word.sub(" ", query.casefold()).split())[:500]
+
+
+class TitleCache:
+    def __init__(self, local: TTLCache, persist: bool):
+        self.local = local
+        self.persist = persist
+        self.persistent_hits = 0
+
+    @staticmethod
+    def key(query: str) -> str:
+        return hashlib.sha256(normalize_query(query).encode()).hexdigest()
+
+    async def get(self, query: str) -> str | None:
+        key = self.key(query)
+        title = self.local.get(key)
+        if title is not None or not self.persist:
+            return title
+
+        async with SessionLocal() as db:
+            entry = await db.get(TitleCacheEntry, key)
+        if entry is None:
+            return None
+
+        self.persistent_hits += 1
+        self.local.set(key, entry.title)
+        return entry.title
+
+    async def set(self, query: str, title: str) -> None:
+        key = self.key(query)
+        self.local.set(key, title)
+        if not self.persist:
+            return
+
+        async with SessionLocal() as db:
+            await db.execute(
+                insert(TitleCacheEntry)
+                .values(key=key, title=title)
+                .on_conflict_do_nothing(index_elements=["key"])
+            )
+            await db.commit()
+
+    def stats(self) -> dict:
+        return {**self.local.stats(), "persistent_hits": self.persistent_hits}
+
+
+title_cache = TitleCache(
+    TTLCache(TITLE_CACHE_SIZE, TITLE_CACHE_TTL), TITLE_CACHE_PERSIST
+)
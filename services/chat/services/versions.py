@@ -0,0 +1,43 @@
+from typing import Hashable
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.db import SessionLocal
+from models.chat import Chat, UserVersion
+
+
+async def bump_chat(db: AsyncSession, chat_id: Hashable) -> None:
+    await db.execute(
+        update(Chat).where(Chat.id == chat_id).values(version=Chat.version + 1)
+    )
+
+
+async def bump_user(db: AsyncSession, user_id: Hashable) -> None:
+    await db.execute(
+        insert(UserVersion)
+        .values(user_id=user_id, version=1)
+        .on_conflict_do_update(
+            index_elements=[UserVersion.user_id],
+            set_={"version": UserVersion.version + 1},
+        )
+    )
+
+
+async def bump_versions(
+    chat_id: Hashable | None = None, user_id: Hashable | None = None
+) -> None:
+    async with SessionLocal() as db:
+        if chat_id is not None:
+            await bump_chat(db, chat_id)
+        if user_id is not None:
+            await bump_user(db, user_id)
+        await db.commit()
+
+
+async def user_version(db: AsyncSession, user_id: Hashable) -> int:
+    version = await db.scalar(
+        select(UserVersion.version).where(UserVersion.user_id == user_id)
+    )
+    return version or 0
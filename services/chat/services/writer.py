@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any
+
+from sqlalchemy import Table, insert
+
+from core.config import WRITER_QUEUE_SIZE, WRITER_BATCH_SIZE, WRITER_MAX_DELAY
+from core.db import Base, engine
+
+Item = tuple[Table, dict[str, Any], asyncio.Future]
+
+
+class WriteBehind:
+    def __init__(self, max_queue: int, max_batch: int, max_delay: float):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.queue: asyncio.Queue[Item | None] = asyncio.Queue(maxsize=max_queue)
+        self.task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self.task is None:
+            return
+        await self.queue.put(None)
+        await self.task
+        self.task = None
+
+    async def insert(self, model: type[Base], values: dict[str, Any]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((model.__table__, values, future))
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            item = await self.queue.get()
+            if item is None:
+                return
+
+            if self.queue.qsize() < self.max_batch:
+                await asyncio.sleep(self.max_delay)
+
+            batch = [item]
+            stopping = False
+            while len(batch) < self.max_batch and not self.queue.empty():
+                item = self.queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+
+            if stopping:
+                return
+
+    async def _write(self, batch: list[Item]) -> None:
+        try:
+            async with engine.begin() as conn:
+                for table in Base.metadata.sorted_tables:
+                    rows = [values for t, values, _ in batch if t is table]
+                    if rows:
+                        await conn.execute(insert(table), rows)
+        except Exception as exc:
+            if len(batch) > 1:
+                for item in batch:
+                    await self._write([item])
+                return
+            _, _, future = batch[0]
+            if not future.done():
+                future.set_exception(exc)
+            return
+
+        for _, _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+
+writer = WriteBehind(WRITER_QUEUE_SIZE, WRITER_BATCH_SIZE, WRITER_MAX_DELAY)
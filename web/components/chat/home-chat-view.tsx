@@ -3,14 +3,11 @@
 import { useEffect, useCallback, useRef } from "react";
 import { useRouter } from "next/navigation";
 import { ChatWindow } from "@/components/chat/chat-window";
-import { useChatsStore } from "@/stores/chats.store";
 import { useThreadStore } from "@/stores/thread.store";
 
 export function HomeChatView() {
   const router = useRouter();
 
-  const createTitle = useChatsStore((s) => s.createTitle);
-
   const activeChatId = useThreadStore((s) => s.activeChatId);
   const isStreaming = useThreadStore((s) => s.isStreaming);
   const clearThread = useThreadStore((s) => s.clearThread);
@@ -35,10 +32,9 @@ export function HomeChatView() {
   const handleSend = useCallback(
     async (query: string) => {
       startedHere.current = true;
-      const chatId = await sendMessage(null, query);
-      if (chatId) void createTitle(chatId, query);
+      await sendMessage(null, query);
     },
-    [sendMessage, createTitle]
+    [sendMessage]
   );
 
   return (
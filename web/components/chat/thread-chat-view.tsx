@@ -5,6 +5,7 @@ import { useParams } from "next/navigation";
 
 import { ScrollArea } from "@/components/ui/scroll-area";
 import { Spinner } from "@/components/ui/spinner";
+import { Button } from "@/components/ui/button";
 import { MessageList } from "@/components/chat/message-list";
 import { ChatWindow } from "@/components/chat/chat-window";
 
@@ -17,8 +18,10 @@ export function ThreadChatView() {
   const messages = useThreadStore((s) => s.messages);
   const activeChatId = useThreadStore((s) => s.activeChatId);
   const isStreaming = useThreadStore((s) => s.isStreaming);
+  const hasOlder = useThreadStore((s) => s.olderCursor !== null);
 
   const loadMessages = useThreadStore((s) => s.loadMessages);
+  const loadOlderMessages = useThreadStore((s) => s.loadOlderMessages);
   const sendMessage = useThreadStore((s) => s.sendMessage);
   const cancelStream = useThreadStore((s) => s.cancelStream);
 
@@ -47,6 +50,17 @@ export function ThreadChatView() {
     >
       <ScrollArea className="flex-1 min-h-0 w-full">
         <div className="mx-auto w-full max-w-[768px] px-4 min-h-full flex flex-col">
+          {hasOlder && (
+            <Button
+              variant="ghost"
+              size="sm"
+              className="mx-auto mt-4 text-muted-foreground"
+              onClick={() => void loadOlderMessages().catch(() => {})}
+            >
+              Load earlier messages
+            </Button>
+          )}
+
           <MessageList messages={messages} />
 
           {isStreaming && last?.role === "assistant" && !last?.content && (
@@ -40,6 +40,8 @@ export function AppSidebar(props: React.ComponentProps<typeof Sidebar>) {
   const pathname = usePathname();
 
   const chats = useChatsStore((s) => s.chats);
+  const hasMoreChats = useChatsStore((s) => s.nextCursor !== null);
+  const loadMoreChats = useChatsStore((s) => s.loadMoreChats);
   const activeChatId = useThreadStore((s) => s.activeChatId);
 
   const user = useAuthStore((s) => s.user) as User | null;
@@ -93,7 +95,12 @@ export function AppSidebar(props: React.ComponentProps<typeof Sidebar>) {
       </SidebarHeader>
 
       <SidebarContent>
-        <NavChats chats={chats} onRemove={handleRemoveChat} />
+        <NavChats
+          chats={chats}
+          hasMore={hasMoreChats}
+          onLoadMore={loadMoreChats}
+          onRemove={handleRemoveChat}
+        />
       </SidebarContent>
 
       <SidebarFooter>
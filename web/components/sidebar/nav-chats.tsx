@@ -30,12 +30,19 @@ import type { Chat } from "@/types/chat";
 
 interface NavChatsProps {
   chats: Chat[];
+  hasMore: boolean;
+  onLoadMore: () => Promise<void>;
   onRemove: (chatId: string) => Promise<void>;
 }
 
 const chatHref = (id: string) => `/chats/${id}`;
 
-export function NavChats({ chats, onRemove }: NavChatsProps) {
+export function NavChats({
+  chats,
+  hasMore,
+  onLoadMore,
+  onRemove,
+}: NavChatsProps) {
   const { isMobile } = useSidebar();
 
   const handleCopyLink = React.useCallback(async (id: string) => {
@@ -109,6 +116,18 @@ export function NavChats({ chats, onRemove }: NavChatsProps) {
             </DropdownMenu>
           </SidebarMenuItem>
         ))}
+
+        {hasMore && (
+          <SidebarMenuItem>
+            <SidebarMenuButton
+              className="text-muted-foreground"
+              onClick={() => void onLoadMore()}
+            >
+              <MoreHorizontal />
+              <span>Show more</span>
+            </SidebarMenuButton>
+          </SidebarMenuItem>
+        )}
       </SidebarMenu>
     </SidebarGroup>
   );
@@ -1,5 +1,6 @@
-import type { SseEvent, ApiError } from "@/types/api";
+import { isApiError, type SseEvent, type ApiError } from "@/types/api";
 import { toUrl, throwApiError } from "@/lib/api";
+import { sseWithRefreshRetry } from "@/lib/retry";
 
 async function* parseSse(
   stream: ReadableStream<Uint8Array>,
@@ -24,6 +25,7 @@ async function* parseSse(
         const raw = buf.slice(0, idx);
         buf = buf.slice(idx + 2);
 
+        let id = "";
         let event = "";
         let data = "";
 
@@ -31,7 +33,9 @@ async function* parseSse(
           if (!line) continue;
           if (line.endsWith("\r")) line = line.slice(0, -1);
 
-          if (line.startsWith("event:")) {
+          if (line.startsWith("id:")) {
+            id = line.slice(3).trim();
+          } else if (line.startsWith("event:")) {
             event = line.slice(6).trim();
           } else if (line.startsWith("data:")) {
             data = line.slice(5).trimStart();
@@ -40,7 +44,7 @@ async function* parseSse(
 
         if (!event) continue;
 
-        yield { event, data };
+        yield { id, event, data };
       }
 
       if (done) break;
@@ -77,3 +81,72 @@ export async function* POST_SSE<TBody>(
 
   yield* parseSse(res.body, signal);
 }
+
+export async function* GET_SSE(
+  path: string,
+  lastEventId: string,
+  signal: AbortSignal
+): AsyncGenerator<SseEvent> {
+  const res = await fetch(toUrl(path), {
+    method: "GET",
+    headers: {
+      Accept: "text/event-stream",
+      "Last-Event-ID": lastEventId,
+    },
+    credentials: "include",
+    signal,
+  });
+
+  if (!res.ok) await throwApiError(res);
+
+  if (!res.body) {
+    throw {
+      status: 500,
+      data: { detail: "Missing response body" },
+    } satisfies ApiError;
+  }
+
+  yield* parseSse(res.body, signal);
+}
+
+const MAX_RESUME_ATTEMPTS = 3;
+const TERMINAL_EVENTS = new Set(["done", "error", "cancelled"]);
+
+export function generationIdOf(eventId: string): string | null {
+  return eventId ? eventId.split(":")[0] : null;
+}
+
+export async function* resumableSse(
+  open: () => AsyncGenerator<SseEvent>,
+  signal: AbortSignal
+): AsyncGenerator<SseEvent> {
+  let source = open();
+  let lastId = "";
+  let attempts = 0;
+
+  while (true) {
+    try {
+      for await (const event of source) {
+        if (event.id) lastId = event.id;
+        attempts = 0;
+
+        yield event;
+
+        if (TERMINAL_EVENTS.has(event.event)) return;
+      }
+    } catch (e) {
+      if (signal.aborted || isApiError(e)) throw e;
+      if (!lastId || attempts >= MAX_RESUME_ATTEMPTS) throw e;
+    }
+
+    if (!lastId || attempts >= MAX_RESUME_ATTEMPTS) return;
+
+    attempts += 1;
+    await new Promise((r) => setTimeout(r, 500 * attempts));
+
+    const generationId = generationIdOf(lastId);
+    source = sseWithRefreshRetry(() =>
+      GET_SSE(`/chats/stream/${generationId}`, lastId, signal)
+    );
+  }
+}
@@ -29,13 +29,20 @@ export const useAuthStore = create<AuthState>((set) => {
     });
   };
 
-  const tryRefresh = async (): Promise<boolean> => {
-    try {
-      const data = (await POST("/auth/refresh")) as { ok?: boolean } | null;
-      return Boolean(data?.ok);
-    } catch {
-      return false;
-    }
+  let refreshing: Promise<boolean> | null = null;
+
+  const tryRefresh = (): Promise<boolean> => {
+    refreshing ??= (async () => {
+      try {
+        const data = (await POST("/auth/refresh")) as { ok?: boolean } | null;
+        return Boolean(data?.ok);
+      } catch {
+        return false;
+      } finally {
+        refreshing = null;
+      }
+    })();
+    return refreshing;
   };
 
   return {
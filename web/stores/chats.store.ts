@@ -7,9 +7,12 @@ import { withRefreshRetry } from "@/lib/retry";
 
 interface ChatsState {
   chats: Chat[];
+  nextCursor: string | null;
 
   loadChats: () => Promise<void>;
+  loadMoreChats: () => Promise<void>;
   addChat: (chatId: string, title?: string) => void;
+  setTitle: (chatId: string, title: string) => void;
 
   createTitle: (chatId: string, query: string) => Promise<void>;
 
@@ -19,15 +22,36 @@ interface ChatsState {
 
 export const useChatsStore = create<ChatsState>((set, get) => ({
   chats: [],
+  nextCursor: null,
 
   loadChats: async () => {
     const data = await withRefreshRetry(() => GET<ApiChatsListDto>("/chats"));
 
     set({
       chats: (data.chats ?? []).map((c) => ({ id: c.id, title: c.title })),
+      nextCursor: data.next_cursor ?? null,
     });
   },
 
+  loadMoreChats: async () => {
+    const cursor = get().nextCursor;
+    if (!cursor) return;
+
+    const data = await withRefreshRetry(() =>
+      GET<ApiChatsListDto>(`/chats?before=${encodeURIComponent(cursor)}`)
+    );
+
+    set((s) => ({
+      chats: [
+        ...s.chats,
+        ...(data.chats ?? [])
+          .filter((c) => !s.chats.some((x) => x.id === c.id))
+          .map((c) => ({ id: c.id, title: c.title })),
+      ],
+      nextCursor: data.next_cursor ?? null,
+    }));
+  },
+
   addChat: (chatId: string, title = "New chat") => {
     set((s) => {
       if (s.chats.some((c) => c.id === chatId)) return s;
@@ -35,16 +59,18 @@ export const useChatsStore = create<ChatsState>((set, get) => ({
     });
   },
 
+  setTitle: (chatId: string, title: string) => {
+    set((s) => ({
+      chats: s.chats.map((c) => (c.id === chatId ? { ...c, title } : c)),
+    }));
+  },
+
   createTitle: async (chatId: string, query: string) => {
     const data = await withRefreshRetry<ApiChatTitleDto>(() =>
       PATCH(`/chats/${chatId}`, { query })
     );
 
-    set((s) => ({
-      chats: s.chats.map((c) =>
-        c.id === chatId ? { ...c, title: data.title } : c
-      ),
-    }));
+    get().setTitle(chatId, data.title);
   },
 
   removeChat: async (chatId: string) => {
@@ -64,7 +90,7 @@ export const useChatsStore = create<ChatsState>((set, get) => ({
     const prev = get().chats;
     if (prev.length === 0) return;
 
-    set({ chats: [] });
+    set({ chats: [], nextCursor: null });
 
     try {
       await withRefreshRetry(() => DELETE("/chats"));
@@ -2,8 +2,8 @@ import { create } from "zustand";
 
 import type { ApiMessagesListDto } from "@/types/api";
 import type { ChatMessage } from "@/types/chat";
-import { GET } from "@/lib/api";
-import { POST_SSE } from "@/lib/sse";
+import { GET, DELETE } from "@/lib/api";
+import { POST_SSE, resumableSse, generationIdOf } from "@/lib/sse";
 import { withRefreshRetry, sseWithRefreshRetry } from "@/lib/retry";
 
 import { useChatsStore } from "@/stores/chats.store";
@@ -14,27 +14,36 @@ const uid = () =>
     : `${Date.now()}-${Math.random()}`;
 
 let currentAbort: AbortController | null = null;
+let currentGenerationId: string | null = null;
 
 interface ThreadState {
   activeChatId: string | null;
   messages: ChatMessage[];
+  olderCursor: string | null;
   isStreaming: boolean;
 
   clearThread: () => void;
   cancelStream: () => void;
 
   loadMessages: (chatId: string) => Promise<void>;
+  loadOlderMessages: () => Promise<void>;
   sendMessage: (chatId: string | null, query: string) => Promise<string | null>;
 }
 
 export const useThreadStore = create<ThreadState>((set, get) => ({
   activeChatId: null,
   messages: [],
+  olderCursor: null,
   isStreaming: false,
 
   clearThread: () => {
     get().cancelStream();
-    set({ activeChatId: null, messages: [], isStreaming: false });
+    set({
+      activeChatId: null,
+      messages: [],
+      olderCursor: null,
+      isStreaming: false,
+    });
   },
 
   cancelStream: () => {
@@ -42,6 +51,10 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
       currentAbort.abort();
       currentAbort = null;
     }
+    if (currentGenerationId) {
+      void DELETE(`/chats/stream/${currentGenerationId}`).catch(() => {});
+      currentGenerationId = null;
+    }
     set({ isStreaming: false });
   },
 
@@ -59,14 +72,38 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
     set({
       activeChatId: chatId,
       isStreaming: false,
-      messages: (data?.messages ?? []).map((m, i) => ({
-        id: `${chatId}:${i}`,
+      olderCursor: data?.next_cursor ?? null,
+      messages: (data?.messages ?? []).map((m) => ({
+        id: m.id,
         role: m.role,
         content: m.content,
       })),
     });
   },
 
+  loadOlderMessages: async () => {
+    const { activeChatId: chatId, olderCursor: cursor } = get();
+    if (!chatId || !cursor) return;
+
+    const data = (await withRefreshRetry(() =>
+      GET(`/chats/${chatId}/messages?before=${encodeURIComponent(cursor)}`)
+    )) as ApiMessagesListDto | null;
+
+    if (get().activeChatId !== chatId) return;
+
+    set((s) => ({
+      olderCursor: data?.next_cursor ?? null,
+      messages: [
+        ...(data?.messages ?? []).map((m) => ({
+          id: m.id,
+          role: m.role,
+          content: m.content,
+        })),
+        ...s.messages,
+      ],
+    }));
+  },
+
   sendMessage: async (
     chatId: string | null,
     query: string
@@ -82,6 +119,7 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
     set((s) => ({
       activeChatId: chatId,
       isStreaming: true,
+      olderCursor: s.activeChatId === chatId ? s.olderCursor : null,
       messages: [
         ...(s.activeChatId === chatId ? s.messages : []),
         { id: userId, role: "user", content: text },
@@ -100,7 +138,14 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
           abort.signal
         );
 
-      for await (const event of sseWithRefreshRetry(make)) {
+      const events = resumableSse(
+        () => sseWithRefreshRetry(make),
+        abort.signal
+      );
+
+      for await (const event of events) {
+        currentGenerationId = generationIdOf(event.id) ?? currentGenerationId;
+
         if (event.event === "meta") {
           const meta = JSON.parse(event.data) as { chat_id: string };
           chatId = meta.chat_id;
@@ -110,6 +155,15 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
           continue;
         }
 
+        if (event.event === "title") {
+          const payload = JSON.parse(event.data) as {
+            chat_id: string;
+            title: string;
+          };
+          useChatsStore.getState().setTitle(payload.chat_id, payload.title);
+          continue;
+        }
+
         if (event.event === "stream") {
           const payload = JSON.parse(event.data) as { text: string };
           const chunk = payload.text ?? "";
@@ -127,7 +181,7 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
           break;
         }
 
-        if (event.event === "done") break;
+        if (event.event === "done" || event.event === "cancelled") break;
       }
     } catch (e) {
       if (e instanceof DOMException && e.name === "AbortError") return chatId;
@@ -135,6 +189,7 @@ export const useThreadStore = create<ThreadState>((set, get) => ({
     } finally {
       if (currentAbort === abort) {
         currentAbort = null;
+        currentGenerationId = null;
         set({ isStreaming: false });
       }
     }
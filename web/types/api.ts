@@ -14,12 +14,19 @@ export type ApiChatDto = {
 };
 
 export type ApiMessageDto = {
+  id: string;
   role: "user" | "assistant";
   content: string;
 };
 
-export type ApiChatsListDto = { chats: ApiChatDto[] };
-export type ApiMessagesListDto = { messages: ApiMessageDto[] };
+export type ApiChatsListDto = {
+  chats: ApiChatDto[];
+  next_cursor?: string | null;
+};
+export type ApiMessagesListDto = {
+  messages: ApiMessageDto[];
+  next_cursor?: string | null;
+};
 
 export type ApiError = {
   status: number;
@@ -33,6 +40,7 @@ export function isApiError(err: unknown): err is ApiError {
 }
 
 export type SseEvent = {
+  id: string;
   event: string;
   data: string;
 };